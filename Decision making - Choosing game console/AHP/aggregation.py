@@ -0,0 +1,111 @@
+from __future__ import annotations
+from typing import Iterable, Iterator, NamedTuple
+import csv
+import itertools
+import json
+import os
+
+import numpy as np
+
+from AHP.ahp import AHP_complete_model, AHP_model, Comparison_matrix, MAX_COMPARISON_VALUE, CRITERIA_MATRIX
+
+
+class Answer(NamedTuple):
+    matrix: str
+    criterion: str
+    first: str
+    second: str
+    value: float
+
+ANSWER_FIELDS = ["respondent"] + list(Answer._fields)
+
+def read_jsonl(path: os.path) -> Iterator[list[Answer]]:
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield [Answer(answer["matrix"], answer.get("criterion", ""), answer["first"], answer["second"], float(answer["value"])) for answer in record["answers"]]
+
+def read_csv(path: os.path) -> Iterator[list[Answer]]:
+    with open(path, 'r', newline='') as f:
+        for _, rows in itertools.groupby(csv.DictReader(f), key=lambda row: row["respondent"]):
+            yield [Answer(row["matrix"], row["criterion"], row["first"], row["second"], float(row["value"])) for row in rows]
+
+def read_answers(path: os.path) -> Iterator[list[Answer]]:
+    return read_csv(path) if str(path).endswith(".csv") else read_jsonl(path)
+
+class Group_aggregator:
+    def __init__(self, model: AHP_model, calculator: AHP_complete_model.Matrix_priority_calculator|None = None):
+        assert(not model.rating_scales)
+        self.model = model
+        self.calculator = calculator or AHP_complete_model.GMM_calculator()
+        self.labels = {key: model.get_matrix_labels(key) for key in model.matrix_keys()}
+        self.index = {key: {label: i for i, label in enumerate(labels)} for key, labels in self.labels.items()}
+        self.log_sums = {key: np.zeros((len(labels), len(labels))) for key, labels in self.labels.items()}
+        self.counts = {key: np.zeros((len(labels), len(labels)), dtype=np.int64) for key, labels in self.labels.items()}
+        self.priority_log_sums = np.zeros(len(model.alternatives))
+        self.priority_sums = np.zeros(len(model.alternatives))
+        self.respondents = 0
+        self.priority_respondents = 0
+
+    def add_respondent(self, answers: Iterable[Answer]) -> Group_aggregator:
+        cells = {}
+        for answer in answers:
+            key = (answer.matrix, answer.criterion if answer.matrix != CRITERIA_MATRIX else "")
+            assert(key in self.labels)
+            assert(1 / MAX_COMPARISON_VALUE <= answer.value <= MAX_COMPARISON_VALUE)
+            rows, columns, logs = cells.setdefault(key, ([], [], []))
+            rows.append(self.index[key][answer.first])
+            columns.append(self.index[key][answer.second])
+            logs.append(np.log(answer.value))
+
+        for key, (rows, columns, logs) in cells.items():
+            np.add.at(self.log_sums[key], (rows, columns), logs)
+            np.add.at(self.log_sums[key], (columns, rows), np.negative(logs))
+            np.add.at(self.counts[key], (rows, columns), 1)
+            np.add.at(self.counts[key], (columns, rows), 1)
+        self.respondents += 1
+
+        if self.__is_complete(cells):
+            priorities = self.__individual_priorities(cells)
+            self.priority_log_sums += np.log(priorities)
+            self.priority_sums += priorities
+            self.priority_respondents += 1
+        return self
+
+    def add_respondents(self, records: Iterable[Iterable[Answer]]) -> Group_aggregator:
+        for answers in records:
+            self.add_respondent(answers)
+        return self
+
+    def add_files(self, paths: Iterable[os.path]) -> Group_aggregator:
+        for path in paths:
+            self.add_respondents(read_answers(path))
+        return self
+
+    def aggregated_model(self) -> AHP_complete_model:
+        model = AHP_model(self.model.criteria, self.model.sub_criteria, self.model.alternatives)
+        for key, labels in self.labels.items():
+            counts = self.counts[key]
+            assert(np.all(counts + np.eye(len(labels), dtype=np.int64) > 0))
+            model = model.add_comparison_matrix(key, Comparison_matrix(labels, np.exp(self.log_sums[key] / np.maximum(counts, 1))))
+        return model
+
+    def aggregated_priorities(self, geometric: bool = True) -> dict[str, float]:
+        assert(self.priority_respondents > 0)
+        priorities = np.exp(self.priority_log_sums / self.priority_respondents) if geometric else self.priority_sums / self.priority_respondents
+        return dict(zip(self.model.alternatives, map(float, priorities / priorities.sum())))
+
+    def __is_complete(self, cells: dict) -> bool:
+        get_pairs = lambda key: set(zip(*cells[key][:2])) | set(zip(*reversed(cells[key][:2])))
+        return all(key in cells and len(get_pairs(key)) == len(labels) * (len(labels) - 1) for key, labels in self.labels.items())
+
+    def __individual_priorities(self, cells: dict) -> np.ndarray:
+        model = AHP_model(self.model.criteria, self.model.sub_criteria, self.model.alternatives)
+        for key, (rows, columns, logs) in cells.items():
+            values = np.eye(len(self.labels[key]))
+            values[rows, columns] = np.exp(logs)
+            values[columns, rows] = np.exp(np.negative(logs))
+            model = model.add_comparison_matrix(key, Comparison_matrix(self.labels[key], values))
+        return model.alternatives_priorities([self.calculator])[0] @ model.leaf_weights(self.calculator)
@@ -1,15 +1,202 @@
 from __future__ import annotations
-from functools import reduce
-from typing import Callable
+from typing import Callable, NamedTuple
 
 from numpy import linalg as LA
 import numpy as np
 import math
-import unittest
+
+from AHP.profiling import profiled
 
 
 MAX_COMPARISON_VALUE = 9
-Comparison_Matrix_type = dict[str, dict[str, float]]
+CRITERIA_MATRIX = "criteria"
+SUB_CRITERIA_MATRIX = "sub_criteria"
+ALTERNATIVES_MATRIX = "alternatives"
+INTENSITIES_MATRIX = "intensities"
+ALTERNATIVES_RATINGS = "ratings"
+KOCZKODAJ_CHUNK_ELEMENTS = 1 << 22
+
+class Comparison_matrix:
+    def __init__(self, labels: list[str], values: np.ndarray):
+        assert(np.shape(values) == (len(labels), len(labels)))
+
+        self.labels = list(labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+
+    @classmethod
+    def filled(cls, labels: list[str], value: float) -> Comparison_matrix:
+        values = np.full((len(labels), len(labels)), value, dtype=np.float64)
+        np.fill_diagonal(values, 1.0)
+        return cls(labels, values)
+
+    @classmethod
+    def from_dict(cls, matrix: dict[str, dict[str, float]]) -> Comparison_matrix:
+        labels = list(matrix.keys())
+        return cls(labels, [[matrix[outer][inner] for inner in labels] for outer in labels])
+
+    def to_dict(self) -> dict[str, dict[str, float]]:
+        return {outer: dict(zip(self.labels, map(float, row))) for outer, row in zip(self.labels, self.values)}
+
+    def values_in_order(self, labels: list[str]) -> np.ndarray:
+        if labels == self.labels:
+            return self.values
+        order = [self.index[label] for label in labels]
+        return self.values[np.ix_(order, order)]
+
+    def __getitem__(self, pair: tuple[str, str]) -> float:
+        first, second = pair
+        return float(self.values[self.index[first], self.index[second]])
+
+    def __contains__(self, label: str) -> bool:
+        return label in self.index
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+Comparison_Matrix_type = Comparison_matrix
+
+def as_comparison_matrix(matrix: Comparison_matrix|dict[str, dict[str, float]]) -> Comparison_matrix:
+    return matrix if isinstance(matrix, Comparison_matrix) else Comparison_matrix.from_dict(matrix)
+
+def stack_comparison_matrices(matrices: list[Comparison_Matrix_type], labels: list[str]) -> np.ndarray:
+    stack = np.empty((len(matrices), len(labels), len(labels)), dtype=np.float64)
+    for layer, matrix in zip(stack, matrices):
+        layer[...] = as_comparison_matrix(matrix).values_in_order(labels)
+    return stack
+
+def koczkodaj_batch(stack: np.ndarray, chunk_elements: int = KOCZKODAJ_CHUNK_ELEMENTS) -> tuple[np.ndarray, np.ndarray]:
+    count, n = stack.shape[0], stack.shape[-1]
+    # Criteria are split first, so a block of them never needs more than one n x n
+    # temporary per criterion over the budget.
+    criteria_chunk = max(1, chunk_elements // max(1, n * n))
+    if count > criteria_chunk:
+        results = [koczkodaj_batch(stack[start:start + criteria_chunk], chunk_elements) for start in range(0, count, criteria_chunk)]
+        return np.concatenate([values for values, _ in results]), np.concatenate([triads for _, triads in results])
+
+    worst_values = np.full(count, -np.inf)
+    worst_triads = np.full((count, 3), -1, dtype=np.intp)
+
+    # Triads (i, j, k) with i < j < k are evaluated for a chunk of i at a time, so
+    # memory stays around max(chunk_elements, n * n) floats no matter how large n gets.
+    chunk = max(1, chunk_elements // max(1, count * n * n))
+    transposed = stack.transpose(0, 2, 1)
+    for start in range(0, max(0, n - 2), chunk):
+        i_index = np.arange(start, min(start + chunk, n - 2))
+        rest = np.arange(start + 1, n)
+        c_ij = stack[:, i_index, start + 1:, np.newaxis]
+        c_ik = stack[:, i_index, np.newaxis, start + 1:]
+        c_kj = transposed[:, np.newaxis, start + 1:, start + 1:]
+        values = np.minimum(np.abs(1 - c_ik * c_kj / c_ij), np.abs(1 - c_ij * c_ik / c_kj))
+        valid = (rest[:, np.newaxis] > i_index[:, np.newaxis, np.newaxis]) & (rest[np.newaxis, :] > rest[:, np.newaxis])
+        valid = valid & (c_ij > 0) & (c_ik > 0) & (c_kj > 0)
+        values = np.where(valid, values, -np.inf).reshape(count, -1)
+
+        best = np.argmax(values, axis=1)
+        best_values = values[np.arange(count), best]
+        improved = best_values > worst_values
+        i, j, k = np.unravel_index(best[improved], (len(i_index), len(rest), len(rest)))
+        worst_values[improved] = best_values[improved]
+        worst_triads[improved] = np.stack((i_index[i], rest[j], rest[k]), axis=1)
+
+    return np.maximum(worst_values, 0.0), worst_triads
+
+def llsm_batch(stack: np.ndarray) -> np.ndarray:
+    # Logarithmic least squares over the known cells only: solves the graph Laplacian
+    # system L v = sum_j log a_ij, which reduces to GMM for complete matrices.
+    n = stack.shape[-1]
+    known = stack > 0
+    log_row_sums = np.where(known, np.log(np.where(known, stack, 1.0)), 0.0).sum(axis=-1)
+    laplacian = np.where(np.eye(n, dtype=bool), known.sum(axis=-1)[..., np.newaxis] - 1, -known.astype(np.float64))
+    log_priorities = LA.solve(laplacian + 1 / n, log_row_sums[..., np.newaxis])[..., 0]
+    priorities = np.exp(log_priorities - log_priorities.max(axis=-1, keepdims=True))
+    return priorities / priorities.sum(axis=-1, keepdims=True)
+
+def harker_matrices(stack: np.ndarray) -> np.ndarray:
+    known = stack > 0
+    diagonal = np.eye(stack.shape[-1], dtype=bool)
+    missing = (~known).sum(axis=-1)
+    return np.where(diagonal, 1.0 + missing[..., np.newaxis], np.where(known, stack, 0.0))
+
+def complete_with_ratios(stack: np.ndarray, priorities: np.ndarray) -> np.ndarray:
+    return np.where(stack > 0, stack, priorities[..., :, np.newaxis] / priorities[..., np.newaxis, :])
+
+def is_connected(adjacency: np.ndarray) -> bool:
+    reached = np.zeros(len(adjacency), dtype=bool)
+    frontier = reached.copy()
+    frontier[:1] = True
+    while np.any(frontier):
+        reached |= frontier
+        frontier = np.any(adjacency[frontier], axis=0) & ~reached
+    return bool(np.all(reached))
+
+def values_from_upper_triangle(upper: np.ndarray) -> np.ndarray:
+    n = int(round((1 + math.sqrt(1 + 8 * len(upper))) / 2))
+    assert(n * (n - 1) // 2 == len(upper))
+
+    values = np.ones((n, n))
+    rows, columns = np.triu_indices(n, 1)
+    values[rows, columns] = upper
+    with np.errstate(divide="ignore"):
+        values[columns, rows] = np.where(upper > 0, 1 / np.asarray(upper, dtype=np.float64), upper)
+    return values
+
+def top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    # Partial selection first, so only the k selected values get sorted. Ties go to the
+    # lower index, which keeps top k a prefix of top k + 1 for paging.
+    k = min(k, len(values))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    threshold = -np.partition(-values, k - 1)[k - 1]
+    above = np.flatnonzero(values > threshold)
+    selected = np.concatenate((above, np.flatnonzero(values == threshold)[:k - len(above)]))
+    return selected[np.lexsort((selected, -values[selected]))]
+
+def validate_comparison_stack(stack: np.ndarray):
+    known = stack != Comparison_builder.UNINITIALIZED_MATRIX_VALUE
+    diagonal = np.eye(stack.shape[-1], dtype=bool)
+    assert(np.all(known == known.swapaxes(-1, -2)))
+    assert(np.all(stack[..., diagonal] == 1))
+    assert(np.all((stack[known] >= 1 / MAX_COMPARISON_VALUE - 1e-12) & (stack[known] <= MAX_COMPARISON_VALUE + 1e-12)))
+    assert(np.allclose(np.where(known, stack * stack.swapaxes(-1, -2), 1.0), 1.0))
+
+class Criteria_hierarchy:
+    def __init__(self, criteria: list[str], sub_criteria: dict[str, list[str]]):
+        # Nodes are numbered the way their local priorities are concatenated: the criteria
+        # matrix first, then one sub-criteria matrix per parent, in sub_criteria order.
+        self.nodes = list(criteria) + [child for children in sub_criteria.values() for child in children]
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        assert(len(self.index) == len(self.nodes))
+        assert(all(parent in self.index for parent in sub_criteria))
+
+        parents = {child: parent for parent, children in sub_criteria.items() for child in children}
+        def get_path(node: str) -> list[int]:
+            path = [self.index[node]]
+            while node in parents:
+                node = parents[node]
+                path.append(self.index[node])
+                assert(len(path) <= len(self.nodes))
+            return path[::-1]
+
+        # Leaves are listed depth first, so the leaves under one criterion stay next to each other
+        stack, self.leaves = list(reversed(criteria)), []
+        while stack:
+            node = stack.pop()
+            if node in sub_criteria:
+                stack += reversed(sub_criteria[node])
+            else:
+                self.leaves.append(node)
+
+        # CSR layout of the leaf-by-node path matrix: row i lists every node from the root to leaf i
+        paths = [get_path(leaf) for leaf in self.leaves]
+        self.indptr = np.cumsum([0] + [len(path) for path in paths]).astype(np.intp)
+        self.indices = np.array([node for path in paths for node in path], dtype=np.intp)
+        self.root_index = self.indices[self.indptr[:-1]]
+        self.depth = int(np.max(np.diff(self.indptr), initial=0))
+
+    def leaf_weights(self, local_priorities: np.ndarray) -> np.ndarray:
+        # A leaf's global weight is the product of the local priorities along its path
+        return np.multiply.reduceat(local_priorities[..., self.indices], self.indptr[:-1], axis=-1)
 
 class Comparison_builder:
 
@@ -17,9 +204,9 @@ class Comparison_builder:
 
     def __init__(self, add_to_model: Callable[[Comparison_Matrix_type], AHP_model|AHP_complete_model], matrix_labels: list[str]):
         self.add_to_model = add_to_model
-
-        get_initial_value = lambda inner, outer: 1.0 if inner == outer else self.UNINITIALIZED_MATRIX_VALUE
-        self.matrix = {outer:{inner: get_initial_value(inner, outer) for inner in matrix_labels} for outer in matrix_labels}
+        self.matrix = Comparison_matrix.filled(matrix_labels, self.UNINITIALIZED_MATRIX_VALUE)
+        self.filled = np.eye(len(matrix_labels), dtype=bool)
+        self.remaining = len(matrix_labels) * (len(matrix_labels) - 1) // 2
         
     def compare(self, first: str, second: str, value: int) -> Comparison_builder|AHP_model|AHP_complete_model:
         assert(value > 0)
@@ -28,15 +215,27 @@ class Comparison_builder:
         assert(first in self.matrix)
         assert(second in self.matrix)
 
-        self.matrix[first][second] = value
-        self.matrix[second][first] = 1 / value
+        i, j = self.matrix.index[first], self.matrix.index[second]
+        self.matrix.values[i, j] = value
+        self.matrix.values[j, i] = 1 / value
+        if not self.filled[i, j]:
+            self.filled[i, j] = self.filled[j, i] = True
+            self.remaining -= 1
 
         if self.__is_finished():
             return self.add_to_model(self.matrix) 
         return self
 
+    def finish(self) -> AHP_model|AHP_complete_model:
+        assert(is_connected(self.filled))
+        return self.add_to_model(self.matrix)
+
+    def missing_pairs(self) -> list[tuple[str, str]]:
+        labels = self.matrix.labels
+        return [(labels[i], labels[j]) for i, j in np.argwhere(np.triu(~self.filled))]
+
     def __is_finished(self) -> bool:
-        return all(all(value != self.UNINITIALIZED_MATRIX_VALUE for value in inner.values()) for inner in self.matrix.values())
+        return self.remaining == 0
 
 class Criteria_comparison_builder(Comparison_builder):
     def __init__(self, model: AHP_model):
@@ -50,77 +249,358 @@ class Alternative_comparison_builder(Comparison_builder):
     def __init__(self, model: AHP_model, criterion: str):
         super().__init__(lambda matrix: model.add_alternatives_comparison_matrix(criterion, matrix), model.alternatives)
 
+class Intensities_comparison_builder(Comparison_builder):
+    def __init__(self, model: AHP_model, criterion: str):
+        super().__init__(lambda matrix: model.add_intensities_comparison_matrix(criterion, matrix), model.rating_scales[criterion])
+
+class Alternative_ratings_builder:
+    def __init__(self, model: AHP_model, criterion: str):
+        self.add_to_model = lambda ratings: model.add_alternatives_ratings(criterion, ratings)
+        self.alternatives_index = {alternative: i for i, alternative in enumerate(model.alternatives)}
+        self.intensities_index = {intensity: i for i, intensity in enumerate(model.rating_scales[criterion])}
+        self.ratings = np.full(len(model.alternatives), -1, dtype=np.intp)
+        self.remaining = len(model.alternatives)
+
+    def rate(self, alternative: str, intensity: str) -> Alternative_ratings_builder|AHP_model|AHP_complete_model:
+        assert(alternative in self.alternatives_index)
+        assert(intensity in self.intensities_index)
+
+        i = self.alternatives_index[alternative]
+        if self.ratings[i] < 0:
+            self.remaining -= 1
+        self.ratings[i] = self.intensities_index[intensity]
+
+        if self.remaining == 0:
+            return self.add_to_model(self.ratings)
+        return self
+
 class AHP_complete_model:
     class Matrix_priority_calculator:
+        name = ""
+        # Set by solvers that report λmax, in the order of the last stack
+        lambda_max = None
+
+        @property
+        def cache_key(self) -> str:
+            return self.name
+
         def calculate(self, matrix: Comparison_Matrix_type) -> dict[str, float]:
+            matrix = as_comparison_matrix(matrix)
+            return dict(zip(matrix.labels, map(float, self.calculate_values(matrix.values))))
+
+        def calculate_values(self, values: np.ndarray) -> np.ndarray:
+            return self.calculate_stack(values[np.newaxis])[0]
+
+        @profiled(lambda self, stack: "calculator/" + self.name, size=lambda self, stack: stack.shape[-1])
+        def calculate_stack(self, stack: np.ndarray) -> np.ndarray:
+            incomplete = np.any(stack <= 0, axis=(-2, -1))
+            if not np.any(incomplete):
+                return self.calculate_batch(stack)
+            priorities = np.empty(stack.shape[:-1])
+            lambda_max = np.empty(stack.shape[:-2])
+            for subset, calculate in ((~incomplete, self.calculate_batch), (incomplete, self.calculate_incomplete_batch)):
+                if np.any(subset):
+                    priorities[subset] = calculate(stack[subset])
+                    # Each subset solve replaces λmax, so it is scattered back like the priorities
+                    if self.lambda_max is not None:
+                        lambda_max[subset] = self.lambda_max
+            if self.lambda_max is not None:
+                self.lambda_max = lambda_max
+            return priorities
+
+        def calculate_batch(self, stack: np.ndarray) -> np.ndarray:
             raise NotImplementedError()
 
+        def calculate_incomplete_batch(self, stack: np.ndarray) -> np.ndarray:
+            return self.calculate_batch(complete_with_ratios(stack, llsm_batch(stack)))
+
     class GMM_calculator(Matrix_priority_calculator):
-        def calculate(self, matrix: Comparison_Matrix_type) -> dict[str, float]:
-            gm_rows = {key:math.prod(values.values()) ** (1 / len(values)) for key, values in matrix.items()}
-            gm_rows_sum = sum(gm_rows.values())
-            return {key: value / gm_rows_sum for key, value in gm_rows.items()}
+        name = "GMM"
+
+        def calculate_batch(self, stack: np.ndarray) -> np.ndarray:
+            gm_rows = np.exp(np.log(stack).mean(axis=-1))
+            return gm_rows / gm_rows.sum(axis=-1, keepdims=True)
+
+        def calculate_incomplete_batch(self, stack: np.ndarray) -> np.ndarray:
+            return llsm_batch(stack)
 
     class EVM_calculator(Matrix_priority_calculator):        
-        def calculate(self, matrix: Comparison_Matrix_type) -> dict[str, float]:
-            np_arr = np.array([[value for value in values.values()] for values in matrix.values()])
-            eigenvalues, eigenvectors = LA.eig(np_arr)
-            max_eigenvector = eigenvectors[:, np.argmax(eigenvalues)]
-            w_max = {key: value for key, value in zip(matrix.keys(), max_eigenvector)}
-            w_max_sum = sum(w_max.values())
-            return {key: value / w_max_sum for key, value in w_max.items()}
+        name = "EVM"
+
+        def calculate_batch(self, stack: np.ndarray) -> np.ndarray:
+            eigenvalues, eigenvectors = LA.eig(stack)
+            max_index = np.argmax(eigenvalues.real, axis=-1)
+            max_eigenvectors = np.take_along_axis(eigenvectors, max_index[:, np.newaxis, np.newaxis], axis=-1)[..., 0].real
+            return max_eigenvectors / max_eigenvectors.sum(axis=-1, keepdims=True)
+
+        def calculate_incomplete_batch(self, stack: np.ndarray) -> np.ndarray:
+            return AHP_complete_model.Harker_calculator().calculate_batch(stack)
+
+    class PowerEVM_calculator(Matrix_priority_calculator):
+        name = "Power EVM"
+        DEFAULT_TOLERANCE = 1e-12
+        DEFAULT_MAX_ITERATIONS = 1000
+
+        def __init__(self, tolerance: float = DEFAULT_TOLERANCE, max_iterations: int = DEFAULT_MAX_ITERATIONS):
+            assert(tolerance > 0)
+            assert(max_iterations > 0)
+
+            self.tolerance = tolerance
+            self.max_iterations = max_iterations
+            self.lambda_max = None
+            self.iterations = 0
+
+        @property
+        def cache_key(self) -> str:
+            # Default parameters keep the plain name, which is also what saved models use
+            if (self.tolerance, self.max_iterations) == (self.DEFAULT_TOLERANCE, self.DEFAULT_MAX_ITERATIONS):
+                return self.name
+            return f"{self.name}(tolerance={self.tolerance!r}, max_iterations={self.max_iterations})"
+
+        def calculate_batch(self, stack: np.ndarray) -> np.ndarray:
+            priorities, self.lambda_max = self.solve(stack)
+            return priorities
+
+        def solve(self, stack: np.ndarray, warm_start: np.ndarray|None = None) -> tuple[np.ndarray, np.ndarray]:
+            if warm_start is None:
+                warm_start = AHP_complete_model.GMM_calculator().calculate_batch(stack)
+            w = np.broadcast_to(warm_start, stack.shape[:-1]).astype(np.float64)
+            w = w / w.sum(axis=-1, keepdims=True)
+
+            lambda_max = np.zeros(stack.shape[:-2])
+            for self.iterations in range(1, self.max_iterations + 1):
+                product = np.matmul(stack, w[..., np.newaxis])[..., 0]
+                # w always sums to 1, so the sum of A @ w is the current λmax estimate
+                lambda_max = product.sum(axis=-1)
+                next_w = product / lambda_max[..., np.newaxis]
+                converged = np.max(np.abs(next_w - w), initial=0.0) <= self.tolerance
+                w = next_w
+                if converged:
+                    break
+
+            return w, lambda_max
+
+        def calculate_incomplete_batch(self, stack: np.ndarray) -> np.ndarray:
+            priorities, self.lambda_max = self.solve(harker_matrices(stack), llsm_batch(stack))
+            return priorities
+
+    class LLSM_calculator(Matrix_priority_calculator):
+        name = "LLSM"
+
+        def calculate_batch(self, stack: np.ndarray) -> np.ndarray:
+            return llsm_batch(stack)
+
+    class Harker_calculator(Matrix_priority_calculator):
+        name = "Harker"
+
+        def calculate_batch(self, stack: np.ndarray) -> np.ndarray:
+            return AHP_complete_model.PowerEVM_calculator().solve(harker_matrices(stack), llsm_batch(stack))[0]
 
     class SimpleColumn_calculator(Matrix_priority_calculator):        
-        def calculate(self, matrix: Comparison_Matrix_type) -> dict[str, float]:
-            n = len(matrix)
-            return {key: sum(values.values()) / n for key, values in matrix.items()}
+        name = "Simple Column"
+
+        def calculate_batch(self, stack: np.ndarray) -> np.ndarray:
+            return stack.sum(axis=-1) / stack.shape[-1]
 
     class SimpleScaledColumn_calculator(Matrix_priority_calculator):
-        def calculate(self, matrix: Comparison_Matrix_type) -> dict[str, float]:
-            row_sum = {key: sum(values.values()) for key, values in matrix.items()}
-            scaled = {key: {inner_key: value / row_sum[key] for inner_key, value in values.items()} for key, values in matrix.items()}
-            return {key: sum(values.values()) / len(values) for key, values in scaled.items()}
+        name = "Simple Scaled Column"
+
+        def calculate_batch(self, stack: np.ndarray) -> np.ndarray:
+            scaled = stack / stack.sum(axis=-1, keepdims=True)
+            return scaled.sum(axis=-1) / stack.shape[-1]
+
+    CALCULATORS = {calculator.name: calculator for calculator in (GMM_calculator, EVM_calculator, PowerEVM_calculator, LLSM_calculator, Harker_calculator, SimpleColumn_calculator, SimpleScaledColumn_calculator)}
+    METHODS = (GMM_calculator.name, EVM_calculator.name, SimpleColumn_calculator.name, SimpleScaledColumn_calculator.name)
     
 
     def __init__(self, model: AHP_model):
         self.model = model
+        self.priority_cache = {}
+        # Calculators behind the cache keys, so updates re-solve with the same parameters
+        self.calculators = {}
+        self.log_row_sums_cache = {}
+        self.leaf_weights_cache = {}
+        self.ranking_cache = {}
+        model.complete_model = self
+
+    def invalidate(self, matrix_key: tuple[str, str]):
+        for priorities in self.priority_cache.values():
+            priorities.pop(matrix_key, None)
+        self.log_row_sums_cache.pop(matrix_key, None)
+        if matrix_key[0] in (CRITERIA_MATRIX, SUB_CRITERIA_MATRIX):
+            self.leaf_weights_cache.clear()
+        self.ranking_cache.clear()
+
+    def update_comparison(self, matrix_key: tuple[str, str], first: str, second: str, value: float) -> AHP_complete_model:
+        matrix = self.model.get_matrix(matrix_key)
+        assert(value > 0)
+        assert(value <= MAX_COMPARISON_VALUE)
+        assert(first != second)
+        assert(first in matrix)
+        assert(second in matrix)
+
+        if not matrix.values.flags.writeable:
+            # Loaded models share a read-only memory map, the first edit gives the matrix its own copy
+            matrix.values = matrix.values.copy()
+        old_value = matrix[first, second]
+        matrix.values[matrix.index[first], matrix.index[second]] = value
+        matrix.values[matrix.index[second], matrix.index[first]] = 1 / value
+
+        labels = self.model.get_matrix_labels(matrix_key)
+        i, j = labels.index(first), labels.index(second)
+        old_priorities = {key: cache[matrix_key] for key, cache in self.priority_cache.items() if matrix_key in cache}
+        for key, priorities in old_priorities.items():
+            self.priority_cache[key][matrix_key] = self.__updated_priorities(self.get_calculator(key), matrix_key, labels, priorities, i, j, old_value, value)
+
+        kind, criterion = matrix_key
+        for key in list(self.ranking_cache):
+            if kind == ALTERNATIVES_MATRIX and not self.model.rating_scales:
+                leaf_weight = self.leaf_weights_cache[key][self.model.leaf_criteria.index(criterion)]
+                # A new array, as scores() already handed the cached one out
+                self.ranking_cache[key] = self.ranking_cache[key] + (self.priority_cache[key][matrix_key] - old_priorities[key]) * leaf_weight
+            else:
+                calculator = self.get_calculator(key)
+                self.leaf_weights_cache.pop(key, None)
+                self.ranking_cache[key] = self.alternatives_priorities([calculator])[0] @ self.leaf_weights(calculator)
+        return self
 
-    def koczkoaj(self, criterion: str):
+    def __updated_priorities(self, calculator: AHP_complete_model.Matrix_priority_calculator, matrix_key: tuple[str, str], labels: list[str], priorities: np.ndarray, i: int, j: int, old_value: float, value: float) -> np.ndarray:
+        if calculator.name == AHP_complete_model.GMM_calculator.name and old_value > 0:
+            # Only rows i and j of the log row sums move, so GMM is patched in O(n)
+            if matrix_key not in self.log_row_sums_cache:
+                with np.errstate(invalid="ignore"):
+                    self.log_row_sums_cache[matrix_key] = np.log(self.model.get_matrix(matrix_key).values_in_order(labels)).sum(axis=1)
+            else:
+                log_row_sums = self.log_row_sums_cache[matrix_key]
+                log_row_sums[i] += math.log(value) - math.log(old_value)
+                log_row_sums[j] -= math.log(value) - math.log(old_value)
+            log_means = self.log_row_sums_cache[matrix_key] / len(labels)
+            if np.all(np.isfinite(log_means)):
+                gm_rows = np.exp(log_means - log_means.max())
+                return gm_rows / gm_rows.sum()
+        self.log_row_sums_cache.pop(matrix_key, None)
+
+        values = self.model.get_matrix(matrix_key).values_in_order(labels)
+        if calculator.name in (AHP_complete_model.EVM_calculator.name, AHP_complete_model.PowerEVM_calculator.name) and np.all(values > 0):
+            solver = calculator if isinstance(calculator, AHP_complete_model.PowerEVM_calculator) else AHP_complete_model.PowerEVM_calculator()
+            return solver.solve(values, warm_start=priorities)[0]
+        return calculator.calculate_values(values)
+
+    class Koczkodaj_index(NamedTuple):
+        value: float
+        triad: tuple[str, str, str]|None
+
+    def koczkoaj(self, criterion: str) -> float:
+        return self.koczkoaj_all([criterion])[criterion].value
+
+    @profiled("koczkodaj", size=lambda self, criteria=None: len(self.model.alternatives))
+    def koczkoaj_all(self, criteria: list[str]|None = None) -> dict[str, AHP_complete_model.Koczkodaj_index]:
+        if criteria is None:
+            criteria = list(self.model.alternatives_comparison_matrixes)
         alts = self.model.alternatives
-        T = []
-        for i in range(len(alts)):
-            for j in range(i+1, len(alts)):
-                for k in range(j+1, len(alts)):
-                    T.append((i, j, k))
-        
-        def c(i, j):
-            return self.model.alternatives_comparison_matrixes[criterion][alts[i]][alts[j]]
+        stack = stack_comparison_matrices([self.model.alternatives_comparison_matrixes[criterion] for criterion in criteria], alts)
+        values, triads = koczkodaj_batch(stack)
+
+        get_triad = lambda triad: tuple(alts[index] for index in triad) if triad[0] >= 0 else None
+        return {criterion: AHP_complete_model.Koczkodaj_index(float(value), get_triad(triad)) for criterion, value, triad in zip(criteria, values, triads)}
+
+    def get_priority_cache(self, calculator: AHP_complete_model.Matrix_priority_calculator) -> dict[tuple[str, str], np.ndarray]:
+        self.calculators.setdefault(calculator.cache_key, calculator)
+        return self.priority_cache.setdefault(calculator.cache_key, {})
+
+    def get_calculator(self, cache_key: str) -> AHP_complete_model.Matrix_priority_calculator:
+        return self.calculators[cache_key] if cache_key in self.calculators else self.CALCULATORS[cache_key]()
+
+    def matrix_priorities(self, calculator: AHP_complete_model.Matrix_priority_calculator, matrix_key: tuple[str, str]) -> np.ndarray:
+        cache = self.get_priority_cache(calculator)
+        if matrix_key not in cache:
+            cache[matrix_key] = calculator.calculate_values(self.model.get_matrix(matrix_key).values_in_order(self.model.get_matrix_labels(matrix_key)))
+        return cache[matrix_key]
+
+    @profiled("alternatives_priorities", size=lambda self, calculators: len(self.model.alternatives))
+    def alternatives_priorities(self, calculators: list[AHP_complete_model.Matrix_priority_calculator]) -> list[np.ndarray]:
+        keys = [(ALTERNATIVES_MATRIX, criterion) for criterion in self.model.leaf_criteria if criterion not in self.model.rating_scales]
+        caches = [self.get_priority_cache(calculator) for calculator in calculators]
+        missing = [key for key in keys if any(key not in cache for cache in caches)]
+
+        if missing:
+            stack = stack_comparison_matrices([self.model.get_matrix(key) for key in missing], self.model.alternatives)
+            for calculator, cache in zip(calculators, caches):
+                todo = [index for index, key in enumerate(missing) if key not in cache]
+                if todo:
+                    priorities = calculator.calculate_stack(stack if len(todo) == len(missing) else stack[todo])
+                    cache.update(zip([missing[index] for index in todo], priorities))
+
+        get_column = lambda calculator, cache, criterion: (
+            self.rated_priorities(calculator, criterion) if criterion in self.model.rating_scales else self.pairwise_column(cache[(ALTERNATIVES_MATRIX, criterion)])
+        )
+        return [np.stack([get_column(calculator, cache, criterion) for criterion in self.model.leaf_criteria], axis=1) for calculator, cache in zip(calculators, caches)]
+
+    def pairwise_column(self, priorities: np.ndarray) -> np.ndarray:
+        # Rated columns are in ideal mode, so with ratings in the model pairwise ones are scaled to their best alternative too
+        return priorities / priorities.max() if self.model.rating_scales else priorities
+
+    def rated_priorities(self, calculator: AHP_complete_model.Matrix_priority_calculator, criterion: str) -> np.ndarray:
+        # Ideal mode: the best intensity scores 1, so a rating never depends on how the other alternatives are rated
+        intensities = self.matrix_priorities(calculator, (INTENSITIES_MATRIX, criterion))
+        return (intensities / intensities.max())[self.model.alternatives_ratings[criterion]]
+
+    def criterion_priorities(self, calculator: AHP_complete_model.Matrix_priority_calculator, criterion: str) -> np.ndarray:
+        if criterion in self.model.rating_scales:
+            return self.rated_priorities(calculator, criterion)
+        return self.pairwise_column(self.matrix_priorities(calculator, (ALTERNATIVES_MATRIX, criterion)))
+
+    def local_priorities(self, calculator: AHP_complete_model.Matrix_priority_calculator) -> np.ndarray:
+        return np.concatenate(
+            [self.matrix_priorities(calculator, (CRITERIA_MATRIX, ""))] +
+            [self.matrix_priorities(calculator, (SUB_CRITERIA_MATRIX, criterion)) for criterion in self.model.sub_criteria]
+        )
 
-        K = {}
-        for (i, j, k) in T:
-            K.update({(i, j, k):min(abs(1-((c(i, k)*c(k, j)/c(i, j)))), abs(1-((c(i, j)*c(i, k)/c(k, j)))))})
+    def local_leaf_priorities(self, calculator: AHP_complete_model.Matrix_priority_calculator) -> np.ndarray:
+        local_priorities = self.local_priorities(calculator)
+        local_priorities[:len(self.model.criteria)] = 1
+        return self.model.hierarchy.leaf_weights(local_priorities)
 
-        return max(K.values())
+    @profiled("leaf_weights", size=lambda self, calculator: len(self.model.leaf_criteria))
+    def leaf_weights(self, calculator: AHP_complete_model.Matrix_priority_calculator) -> np.ndarray:
+        if calculator.cache_key not in self.leaf_weights_cache:
+            self.leaf_weights_cache[calculator.cache_key] = self.model.hierarchy.leaf_weights(self.local_priorities(calculator))
+        return self.leaf_weights_cache[calculator.cache_key]
 
     def __calculate(self, calculator: AHP_complete_model.Matrix_priority_calculator) -> dict[str, float]:
-        get_criteria_or_sub_criteria = lambda criterion: self.model.sub_criteria[criterion] if criterion in self.model.sub_criteria else [criterion]
-        final_criterion_list = reduce(lambda acc, criterion: acc + get_criteria_or_sub_criteria(criterion), self.model.criteria, [])
-        alternatives_priorities = {criterion:calculator.calculate(self.model.alternatives_comparison_matrixes[criterion]) for criterion in final_criterion_list}
-        
-        get_parent_criterion = lambda criterion: next((parent_criterion for parent_criterion in self.model.sub_criteria if criterion in self.model.sub_criteria[parent_criterion]), "")
+        return self.__calculate_all([calculator])[calculator.name]
 
-        criteria_priorities = calculator.calculate(self.model.criterion_comparison_matrix)
-        sub_criteria_priorities = {criterion:calculator.calculate(self.model.sub_criterion_comparison_matrixes[criterion]) for criterion in self.model.sub_criteria}
+    @profiled("calculate", size=lambda self, calculators: len(self.model.alternatives))
+    def __calculate_all(self, calculators: list[AHP_complete_model.Matrix_priority_calculator]) -> dict[str, dict[str, float]]:
+        return {calculator.name: dict(zip(self.model.alternatives, map(float, scores))) for calculator, scores in zip(calculators, self.__scores(calculators))}
 
-        get_sub_criterion_priority = lambda sub_criterion: sub_criteria_priorities[get_parent_criterion(sub_criterion)][sub_criterion] * criteria_priorities[get_parent_criterion(sub_criterion)]
-        get_criterion_priority = lambda criterion: criteria_priorities[criterion] if criterion in criteria_priorities else get_sub_criterion_priority(criterion)
+    def __scores(self, calculators: list[AHP_complete_model.Matrix_priority_calculator]) -> list[np.ndarray]:
+        missing = [calculator for calculator in calculators if calculator.cache_key not in self.ranking_cache]
+        for calculator, alternatives_priorities in zip(missing, self.alternatives_priorities(missing)):
+            self.ranking_cache[calculator.cache_key] = alternatives_priorities @ self.leaf_weights(calculator)
+        return [self.ranking_cache[calculator.cache_key] for calculator in calculators]
 
-        calculate_alternative_priority = lambda alternative: (
-            sum([alternatives_priorities[criterion][alternative] * get_criterion_priority(criterion) for criterion in final_criterion_list])
-        )
+    def calculate_all(self) -> dict[str, dict[str, float]]:
+        return self.__calculate_all([self.CALCULATORS[name]() for name in self.METHODS])
+
+
+    def simulate_robustness(self, samples: int, sigma: float = 0.2, seed: int|None = None, workers: int|None = None, calculator: AHP_complete_model.Matrix_priority_calculator|None = None):
+        from AHP.robustness import Robustness_analysis
+        return Robustness_analysis(self, calculator).simulate(samples, sigma, seed=seed, workers=workers)
 
-        return {alternative:calculate_alternative_priority(alternative) for alternative in self.model.alternatives}
+    def scores(self, name: str) -> np.ndarray:
+        return self.__scores([self.CALCULATORS[name]()])[0]
 
+    def top_k(self, name: str, k: int, start: int = 0) -> list[tuple[str, float]]:
+        scores = self.scores(name)
+        return [(self.model.alternatives[index], float(scores[index])) for index in top_k_indices(scores, start + k)[start:]]
+
+    def consistency(self, table=None):
+        from AHP.consistency import model_consistency
+        return model_consistency(self, table)
+
+    def calculate_method(self, name: str) -> dict[str, float]:
+        return self.__calculate(self.CALCULATORS[name]())
 
     def calculate_gmm(self) -> dict[str, float]:
         return self.__calculate(AHP_complete_model.GMM_calculator())
@@ -128,6 +608,9 @@ class AHP_complete_model:
     def calculate_evm(self) -> dict[str, float]:
        return self.__calculate(AHP_complete_model.EVM_calculator())
 
+    def calculate_power_evm(self, tolerance: float = PowerEVM_calculator.DEFAULT_TOLERANCE, max_iterations: int = PowerEVM_calculator.DEFAULT_MAX_ITERATIONS) -> dict[str, float]:
+        return self.__calculate(AHP_complete_model.PowerEVM_calculator(tolerance, max_iterations))
+
     def calculate_simple_column(self) -> dict[str, float]:
         return self.__calculate(AHP_complete_model.SimpleColumn_calculator())
 
@@ -137,14 +620,24 @@ class AHP_complete_model:
     
 
 class AHP_model:
-    def __init__(self, criteria: list[str], sub_criteria: dict[str, list[str]],  alternatives: list[str]):
+    def __init__(self, criteria: list[str], sub_criteria: dict[str, list[str]],  alternatives: list[str], rating_scales: dict[str, list[str]]|None = None):
         self.criteria = criteria
         self.sub_criteria = sub_criteria
         self.alternatives = alternatives
-        self.criterion_count = (len(criteria) - len(sub_criteria)) + sum(map(lambda sub_criteria_list: len(sub_criteria_list), sub_criteria.values()))
+        self.rating_scales = rating_scales or {}
+        self.hierarchy = Criteria_hierarchy(criteria, sub_criteria)
+        self.leaf_criteria = self.hierarchy.leaves
+        self.leaf_root_index = self.hierarchy.root_index
+        self.criterion_count = len(self.leaf_criteria)
         self.alternatives_comparison_matrixes = {}
-        self.criterion_comparison_matrix = {}
+        self.criterion_comparison_matrix = None
         self.sub_criterion_comparison_matrixes = {}
+        self.intensities_comparison_matrixes = {}
+        self.alternatives_ratings = {}
+        assert(all(criterion in self.leaf_criteria and len(intensities) > 0 for criterion, intensities in self.rating_scales.items()))
+        # A rated criterion takes ratings instead of an alternatives matrix, plus its intensities matrix
+        self.remaining_matrices = self.criterion_count + 1 + len(sub_criteria) + len(self.rating_scales)
+        self.complete_model = None
 
     def build_alternatives_comparison(self, criterion: str) -> Alternative_comparison_builder:
         assert(self.__can_build_alternatives_comparison_of(criterion))
@@ -157,34 +650,116 @@ class AHP_model:
         assert(criterion in self.sub_criteria)
         return Sub_criteria_comparison_builder(self, criterion)
 
+    def build_intensities_comparison(self, criterion: str) -> Intensities_comparison_builder:
+        assert(criterion in self.rating_scales)
+        return Intensities_comparison_builder(self, criterion)
+
+    def build_alternatives_ratings(self, criterion: str) -> Alternative_ratings_builder:
+        assert(criterion in self.rating_scales)
+        return Alternative_ratings_builder(self, criterion)
+
     def add_alternatives_comparison_matrix(self, criterion: str, matrix: Comparison_Matrix_type) -> AHP_model|AHP_complete_model:
-        self.alternatives_comparison_matrixes.update({criterion:matrix})
-        return self.__return_model()
+        if criterion not in self.alternatives_comparison_matrixes: self.remaining_matrices -= 1
+        # Stored as the instance get_matrix hands out, so update_comparison edits what is scored
+        self.alternatives_comparison_matrixes.update({criterion:as_comparison_matrix(matrix)})
+        return self.__return_model((ALTERNATIVES_MATRIX, criterion))
 
     def add_criterion_comparison_matrix(self, matrix: Comparison_Matrix_type) -> AHP_model|AHP_complete_model:
-        self.criterion_comparison_matrix = matrix
-        return self.__return_model()
+        if self.criterion_comparison_matrix is None: self.remaining_matrices -= 1
+        self.criterion_comparison_matrix = as_comparison_matrix(matrix)
+        return self.__return_model((CRITERIA_MATRIX, ""))
 
     def add_sub_criterion_comparison_matrix(self, criterion: str, matrix: Comparison_Matrix_type) -> AHP_model|AHP_complete_model:
-        self.sub_criterion_comparison_matrixes.update({criterion:matrix})
-        return self.__return_model()
-        
+        if criterion not in self.sub_criterion_comparison_matrixes: self.remaining_matrices -= 1
+        self.sub_criterion_comparison_matrixes.update({criterion:as_comparison_matrix(matrix)})
+        return self.__return_model((SUB_CRITERIA_MATRIX, criterion))
+
+    def add_intensities_comparison_matrix(self, criterion: str, matrix: Comparison_Matrix_type) -> AHP_model|AHP_complete_model:
+        if criterion not in self.intensities_comparison_matrixes: self.remaining_matrices -= 1
+        self.intensities_comparison_matrixes.update({criterion:as_comparison_matrix(matrix)})
+        return self.__return_model((INTENSITIES_MATRIX, criterion))
+
+    def add_alternatives_ratings(self, criterion: str, ratings: np.ndarray|dict[str, str]) -> AHP_model|AHP_complete_model:
+        assert(criterion in self.rating_scales)
+        if isinstance(ratings, dict):
+            intensities_index = {intensity: i for i, intensity in enumerate(self.rating_scales[criterion])}
+            ratings = [intensities_index[ratings[alternative]] for alternative in self.alternatives]
+        ratings = np.array(ratings, dtype=np.intp)
+        assert(ratings.shape == (len(self.alternatives),))
+        assert(np.all((ratings >= 0) & (ratings < len(self.rating_scales[criterion]))))
+
+        if criterion not in self.alternatives_ratings: self.remaining_matrices -= 1
+        self.alternatives_ratings.update({criterion:ratings})
+        return self.__return_model((ALTERNATIVES_RATINGS, criterion))
+
+    def matrix_keys(self) -> list[tuple[str, str]]:
+        return (
+            [(CRITERIA_MATRIX, "")] +
+            [(SUB_CRITERIA_MATRIX, criterion) for criterion in self.sub_criteria] +
+            [(INTENSITIES_MATRIX, criterion) if criterion in self.rating_scales else (ALTERNATIVES_MATRIX, criterion) for criterion in self.leaf_criteria]
+        )
+
+    def add_comparison_matrix(self, matrix_key: tuple[str, str], matrix: Comparison_Matrix_type) -> AHP_model|AHP_complete_model:
+        assert(matrix_key in self.matrix_keys())
+        kind, criterion = matrix_key
+        if kind == CRITERIA_MATRIX: return self.add_criterion_comparison_matrix(matrix)
+        if kind == SUB_CRITERIA_MATRIX: return self.add_sub_criterion_comparison_matrix(criterion, matrix)
+        if kind == INTENSITIES_MATRIX: return self.add_intensities_comparison_matrix(criterion, matrix)
+        return self.add_alternatives_comparison_matrix(criterion, matrix)
+
+    @profiled("add_comparison_values")
+    def add_comparison_values(self, matrices: dict[tuple[str, str], np.ndarray]) -> AHP_model|AHP_complete_model:
+        get_values = lambda values: np.asarray(values, dtype=np.float64) if np.ndim(values) == 2 else values_from_upper_triangle(np.asarray(values, dtype=np.float64))
+        assert(set(matrices) <= set(self.matrix_keys()))
+        values = {key: get_values(matrix) for key, matrix in matrices.items()}
+        for key, matrix in values.items():
+            assert(matrix.shape == (len(self.get_matrix_labels(key)),) * 2)
+
+        by_size = {}
+        for key, matrix in values.items():
+            by_size.setdefault(len(matrix), []).append(key)
+        for keys in by_size.values():
+            stack = np.stack([values[key] for key in keys])
+            validate_comparison_stack(stack)
+            incomplete = np.any(stack == Comparison_builder.UNINITIALIZED_MATRIX_VALUE, axis=(-2, -1))
+            assert(all(is_connected(layer > 0) for layer in stack[incomplete]))
+
+        result = self
+        for key, matrix in values.items():
+            result = self.add_comparison_matrix(key, Comparison_matrix(self.get_matrix_labels(key), matrix))
+        return result
+
+    def has_matrix(self, matrix_key: tuple[str, str]) -> bool:
+        kind, criterion = matrix_key
+        if kind == CRITERIA_MATRIX: return self.criterion_comparison_matrix is not None
+        if kind == SUB_CRITERIA_MATRIX: return criterion in self.sub_criterion_comparison_matrixes
+        if kind == INTENSITIES_MATRIX: return criterion in self.intensities_comparison_matrixes
+        return criterion in self.alternatives_comparison_matrixes
+
+    def get_matrix(self, matrix_key: tuple[str, str]) -> Comparison_Matrix_type:
+        kind, criterion = matrix_key
+        if kind == CRITERIA_MATRIX: return as_comparison_matrix(self.criterion_comparison_matrix)
+        if kind == SUB_CRITERIA_MATRIX: return as_comparison_matrix(self.sub_criterion_comparison_matrixes[criterion])
+        if kind == INTENSITIES_MATRIX: return as_comparison_matrix(self.intensities_comparison_matrixes[criterion])
+        return as_comparison_matrix(self.alternatives_comparison_matrixes[criterion])
+
+    def get_matrix_labels(self, matrix_key: tuple[str, str]) -> list[str]:
+        kind, criterion = matrix_key
+        if kind == CRITERIA_MATRIX: return self.criteria
+        if kind == SUB_CRITERIA_MATRIX: return self.sub_criteria[criterion]
+        if kind == INTENSITIES_MATRIX: return self.rating_scales[criterion]
+        return self.alternatives
+
     def __can_build_alternatives_comparison_of(self, criterion: str) -> bool:
-        return (criterion in self.criteria and criterion not in self.sub_criteria) or self.__is_sub_criterion(criterion)
-    
-    def __is_sub_criterion(self, criterion: str) -> bool:
-        return any(map(lambda sub_criteria_list: criterion in sub_criteria_list, self.sub_criteria.values()))
+        return criterion in self.hierarchy.index and criterion not in self.sub_criteria and criterion not in self.rating_scales
 
-    def __return_model(self) -> AHP_model|AHP_complete_model:
-        if(self.__is_finished()): return AHP_complete_model(self)
+    def __return_model(self, changed_matrix_key: tuple[str, str]) -> AHP_model|AHP_complete_model:
+        if self.complete_model is not None: self.complete_model.invalidate(changed_matrix_key)
+        if(self.__is_finished()): return self.complete_model or AHP_complete_model(self)
         return self
 
     def __is_finished(self) -> bool:
-        return ( 
-            len(self.criterion_comparison_matrix) != 0 and 
-            len(self.alternatives_comparison_matrixes) == self.criterion_count and
-            len(self.sub_criterion_comparison_matrixes) == len(self.sub_criteria)
-        )
+        return self.remaining_matrices == 0
             
 
     
@@ -193,6 +768,7 @@ class AHP_builder:
         self.criteria = []
         self.alternatives = []
         self.sub_criteria = {}
+        self.rating_scales = {}
 
     def add_alternative(self, name: str) -> AHP_builder:
         self.alternatives.append(name)
@@ -203,7 +779,7 @@ class AHP_builder:
         return self
 
     def add_sub_criterion(self, criterion, name: str) -> AHP_builder:
-        assert(criterion in self.criteria)
+        assert(criterion in self.criteria or any(criterion in sub_criteria for sub_criteria in self.sub_criteria.values()))
 
         if criterion not in self.sub_criteria:
             self.sub_criteria.update({criterion:[name]})
@@ -211,133 +787,12 @@ class AHP_builder:
             self.sub_criteria[criterion].append(name)
         return self
 
+    def add_rating_scale(self, criterion: str, intensities: list[str]) -> AHP_builder:
+        self.rating_scales.update({criterion:list(intensities)})
+        return self
+
     def build(self) -> AHP_model:
         assert(len(self.criteria) > 0)
         assert(len(self.alternatives) > 0)
 
-        return AHP_model(self.criteria, self.sub_criteria, self.alternatives)
-
-
-class TestAHP(unittest.TestCase):
-
-    def test_basic_example(self):
-        ahp_result = (
-            AHP_builder()
-            .add_alternative("A")
-            .add_alternative("B")
-            .add_criterion("X")
-            .add_criterion("Y")
-            .build()
-            .build_alternatives_comparison("X")
-            .compare("A", "B", 9)
-            .build_alternatives_comparison("Y")
-            .compare("A", "B", 1)
-            .build_criteria_comparison()
-            .compare("X", "Y", 9)
-            .calculate_gmm()
-        )
-
-        self.assertGreater(ahp_result["A"], ahp_result["B"])
-
-    def test_wikipedia_leader(self):
-        # https://en.wikipedia.org/wiki/Analytic_hierarchy_process_–_leader_example
-        ahp_result = (
-            AHP_builder()
-            .add_alternative("Tom")
-            .add_alternative("Dick")
-            .add_alternative("Harry")
-            .add_criterion("Experience")
-            .add_criterion("Education")
-            .add_criterion("Charisma")
-            .add_criterion("Age")
-            .build()
-            .build_alternatives_comparison("Experience")
-            .compare("Dick", "Tom", 4)
-            .compare("Tom", "Harry", 4)
-            .compare("Dick", "Harry", 9)
-            .build_alternatives_comparison("Education")
-            .compare("Tom", "Dick", 3)
-            .compare("Harry", "Tom", 5)
-            .compare("Harry", "Dick", 7)
-            .build_alternatives_comparison("Charisma")
-            .compare("Tom", "Dick", 5)
-            .compare("Tom", "Harry", 9)
-            .compare("Dick", "Harry", 4)
-            .build_alternatives_comparison("Age")
-            .compare("Dick", "Tom", 3)
-            .compare("Tom", "Harry", 5)
-            .compare("Dick", "Harry", 9)
-            .build_criteria_comparison()
-            .compare("Experience", "Education", 4)
-            .compare("Experience", "Charisma", 3)
-            .compare("Experience", "Age", 7)
-            .compare("Education", "Age", 3)
-            .compare("Charisma", "Education", 3)
-            .compare("Charisma", "Age", 5)
-            .calculate_gmm()
-        )
-
-        ranking = [k for k, _ in sorted(ahp_result.items(), key=lambda item: item[1], reverse=True)]
-        self.assertEqual(ranking, ["Dick", "Tom", "Harry"])
-
-    def test_sub_criteria(self):
-        ahp_result = (
-            AHP_builder()
-            .add_alternative("A")
-            .add_alternative("B")
-            .add_criterion("X")
-            .add_criterion("Y")
-            .add_sub_criterion("X", "X1")
-            .add_sub_criterion("X", "X2")
-            .build()
-            .build_alternatives_comparison("Y")
-            .compare("A", "B", 1)
-            .build_alternatives_comparison("X1")
-            .compare("A", "B", 2)
-            .build_alternatives_comparison("X2")
-            .compare("B", "A", 3)
-            .build_criteria_comparison()
-            .compare("X", "Y", 1)
-            .build_sub_criteria_comparison("X")
-            .compare("X1", "X2", 2)
-            .calculate_gmm()
-        )
-
-        self.assertGreater(ahp_result["A"], ahp_result["B"])
-
-    def test_koczkodaj(self):
-        alts = ["a", "b", "c", "d", "e"]
-        cryt = ["1"]
-        mat_list = [
-            [1, 69/74, 10/31, 7/22, 19/7],
-            [74/69, 1, 27/43, 2/3, 34/13],
-            [31/10, 43/27, 1, 47/38, 73/7],
-            [22/7, 3/2, 38/47, 1, 7],
-            [7/19, 13/34, 7/73, 1/7, 1],
-        ]
-        mat_dict = {
-            alts[a]:{alts[b]:mat_list[a][b] for b in range(len(alts))} for a in range(len(alts))
-        }
-        model = AHP_model(cryt, {}, alts)
-        model.alternatives_comparison_matrixes = {"1":mat_dict}
-        complete = AHP_complete_model(model)
-
-        self.assertAlmostEqual(complete.koczkoaj("1"), 0.60059, 5)
-
-    def test_evm(self):
-        matrix = {
-            "a": {"a": 1, "b": 2, "c": 3},
-            "b": {"a": 1/2, "b": 1, "c": 4},
-            "c": {"a": 1/3, "b": 1/4, "c": 1},
-        }
-        result = AHP_complete_model.EVM_calculator().calculate(matrix)
-        self.assertAlmostEqual(result["a"], 0.517, 2)
-        self.assertAlmostEqual(result["b"], 0.358, 2)
-        self.assertAlmostEqual(result["c"], 0.124, 2)
-        
-
-
-
-if __name__ == '__main__':
-    unittest.main()
-
+        return AHP_model(self.criteria, self.sub_criteria, self.alternatives, self.rating_scales)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+from typing import NamedTuple
+import json
+import os
+
+import numpy as np
+
+from AHP.ahp import AHP_complete_model, MAX_COMPARISON_VALUE, harker_matrices
+from AHP.profiling import profiled
+
+
+RANDOM_INDEX_SAMPLES = 2000
+MIN_RANDOM_INDEX_SAMPLES = 64
+# Upper bound on the float64 elements one Monte Carlo batch of random matrices may take
+RANDOM_INDEX_CHUNK_ELEMENTS = 1 << 22
+RANDOM_INDEX_VERSION = 1
+SAATY_SCALE = np.array([1 / value for value in range(MAX_COMPARISON_VALUE, 1, -1)] + list(range(1, MAX_COMPARISON_VALUE + 1)), dtype=np.float64)
+
+def get_default_random_index_path() -> str:
+    return os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser(os.path.join("~", ".cache"))), "ahp", "random_index.json")
+
+def lambda_max_batch(stack: np.ndarray, priorities: np.ndarray) -> np.ndarray:
+    # Exact for the principal eigenvector, and averaged over rows for anything close to it
+    return (np.matmul(stack, priorities[..., np.newaxis])[..., 0] / priorities).mean(axis=-1)
+
+def consistency_index_batch(lambda_max: np.ndarray, n: int) -> np.ndarray:
+    return (lambda_max - n) / (n - 1) if n > 2 else np.zeros_like(lambda_max)
+
+def geometric_consistency_index_batch(stack: np.ndarray, priorities: np.ndarray) -> np.ndarray:
+    n = stack.shape[-1]
+    if n <= 2:
+        return np.zeros(stack.shape[:-2])
+    known = np.triu(stack > 0, 1)
+    errors = np.log(np.where(known, stack, 1.0)) - np.log(priorities[..., :, np.newaxis]) + np.log(priorities[..., np.newaxis, :])
+    squares = np.where(known, errors ** 2, 0.0).sum(axis=(-2, -1))
+    # Missing cells are left out and the sum is scaled back to all n(n-1)/2 pairs
+    pairs = n * (n - 1) / 2
+    return 2 / ((n - 1) * (n - 2)) * squares * pairs / known.sum(axis=(-2, -1))
+
+def random_reciprocal_matrices(rng: np.random.Generator, samples: int, n: int) -> np.ndarray:
+    rows, columns = np.triu_indices(n, 1)
+    stack = np.ones((samples, n, n))
+    upper = SAATY_SCALE[rng.integers(0, len(SAATY_SCALE), (samples, len(rows)))]
+    stack[:, rows, columns] = upper
+    stack[:, columns, rows] = 1 / upper
+    return stack
+
+def simulate_random_index(n: int, samples: int = RANDOM_INDEX_SAMPLES, seed: int = 0) -> float:
+    if n <= 2:
+        return 0.0
+    rng = np.random.default_rng([seed, n])
+    chunk = max(1, RANDOM_INDEX_CHUNK_ELEMENTS // (n * n))
+    calculator = AHP_complete_model.PowerEVM_calculator(tolerance=1e-10)
+    lambda_sum = 0.0
+    for start in range(0, samples, chunk):
+        lambda_sum += calculator.solve(random_reciprocal_matrices(rng, min(chunk, samples - start), n))[1].sum()
+    return float((lambda_sum / samples - n) / (n - 1))
+
+class Random_index_table:
+    def __init__(self, path: str|None = None, samples: int = RANDOM_INDEX_SAMPLES, seed: int = 0):
+        self.path = path
+        self.samples = samples
+        self.seed = seed
+        self.values = None
+
+    def get(self, n: int) -> float:
+        return self.get_many([n])[n]
+
+    def get_many(self, sizes: list[int]) -> dict[int, float]:
+        if self.values is None:
+            self.values = self.__load()
+        missing = sorted(set(sizes) - set(self.values))
+        for n in missing:
+            self.values[n] = simulate_random_index(n, self.get_samples(n), self.seed)
+        if missing:
+            self.__save()
+        return {n: self.values[n] for n in sizes}
+
+    def get_samples(self, n: int) -> int:
+        # λmax of random matrices concentrates as n grows, so large n needs fewer samples
+        return int(np.clip(RANDOM_INDEX_CHUNK_ELEMENTS * 4 // max(n * n, 1), MIN_RANDOM_INDEX_SAMPLES, self.samples))
+
+    def __load(self) -> dict[int, float]:
+        if self.path is None or not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r') as f:
+            header = json.load(f)
+        if (header.get("version"), header.get("samples"), header.get("seed")) != (RANDOM_INDEX_VERSION, self.samples, self.seed):
+            return {}
+        return {int(n): value for n, value in header["values"].items()}
+
+    def __save(self):
+        if self.path is None:
+            return
+        header = {"version": RANDOM_INDEX_VERSION, "samples": self.samples, "seed": self.seed, "values": {str(n): value for n, value in sorted(self.values.items())}}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temporary_path = self.path + ".tmp"
+            with open(temporary_path, 'w') as f:
+                json.dump(header, f, indent=1)
+            os.replace(temporary_path, self.path)
+        except OSError:
+            # The table is only a cache, an unwritable location just means recomputing next run
+            pass
+
+random_index_table = Random_index_table(get_default_random_index_path())
+
+class Consistency(NamedTuple):
+    size: int
+    lambda_max: float
+    consistency_index: float
+    consistency_ratio: float
+    geometric_index: float
+
+@profiled("consistency")
+def model_consistency(complete_model: AHP_complete_model, table: Random_index_table|None = None) -> dict[tuple[str, str], Consistency]:
+    table = table or random_index_table
+    model = complete_model.model
+    by_size = {}
+    for key in filter(model.has_matrix, model.matrix_keys()):
+        by_size.setdefault(len(model.get_matrix_labels(key)), []).append(key)
+    random_indices = table.get_many(list(by_size))
+
+    result = {}
+    for n, keys in by_size.items():
+        stack = np.stack([model.get_matrix(key).values_in_order(model.get_matrix_labels(key)) for key in keys])
+        eigenvectors = get_cached_priorities(complete_model, AHP_complete_model.EVM_calculator(), keys, stack)
+        geometric_means = get_cached_priorities(complete_model, AHP_complete_model.GMM_calculator(), keys, stack)
+
+        # EVM priorities of incomplete matrices are Harker eigenvectors, so λmax comes from the same matrix
+        incomplete = np.any(stack <= 0, axis=(-2, -1))
+        eigen_stack = np.where(incomplete[:, np.newaxis, np.newaxis], harker_matrices(stack), stack) if np.any(incomplete) else stack
+        lambda_max = lambda_max_batch(eigen_stack, eigenvectors)
+        consistency_index = consistency_index_batch(lambda_max, n)
+        consistency_ratio = consistency_index / random_indices[n] if random_indices[n] > 0 else np.zeros_like(consistency_index)
+        geometric_index = geometric_consistency_index_batch(stack, geometric_means)
+
+        for index, key in enumerate(keys):
+            result[key] = Consistency(n, float(lambda_max[index]), float(consistency_index[index]), float(consistency_ratio[index]), float(geometric_index[index]))
+    return result
+
+def get_cached_priorities(complete_model: AHP_complete_model, calculator: AHP_complete_model.Matrix_priority_calculator, keys: list[tuple[str, str]], stack: np.ndarray) -> np.ndarray:
+    cache = complete_model.get_priority_cache(calculator)
+    missing = [index for index, key in enumerate(keys) if key not in cache]
+    if missing:
+        cache.update(zip([keys[index] for index in missing], calculator.calculate_stack(stack[missing])))
+    return np.stack([cache[key] for key in keys])
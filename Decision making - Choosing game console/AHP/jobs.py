@@ -0,0 +1,108 @@
+from __future__ import annotations
+from typing import Callable, NamedTuple
+import threading
+
+import numpy as np
+
+from AHP.ahp import AHP_complete_model, AHP_model
+
+
+class Job_cancelled(Exception):
+    pass
+
+class Scoring_job:
+    class Progress(NamedTuple):
+        stage: str
+        done: int
+        total: int
+
+    class Criterion_result(NamedTuple):
+        criterion: str
+        koczkodaj: AHP_complete_model.Koczkodaj_index|None
+        partial_scores: np.ndarray
+
+    MODEL_STAGE = "model"
+    CRITERIA_STAGE = "criteria"
+    RANKING_STAGE = "ranking"
+
+    def __init__(
+        self,
+        get_model: Callable[[], AHP_model|AHP_complete_model],
+        method: str = AHP_complete_model.GMM_calculator.name,
+        on_progress: Callable[[Scoring_job.Progress], None]|None = None,
+        on_criterion: Callable[[Scoring_job.Criterion_result], None]|None = None,
+        on_ranking: Callable[[np.ndarray], None]|None = None,
+        on_error: Callable[[BaseException], None]|None = None,
+        dispatch: Callable[[Callable[[], None]], None]|None = None,
+    ):
+        self.get_model = get_model
+        self.calculator = AHP_complete_model.CALCULATORS[method]()
+        self.on_progress = on_progress
+        self.on_criterion = on_criterion
+        self.on_ranking = on_ranking
+        self.on_error = on_error
+        # Callbacks are handed to dispatch, so a UI can run them on its own thread
+        self.dispatch = dispatch or (lambda callback: callback())
+        self.cancelled = threading.Event()
+        self.finished = threading.Event()
+        self.thread = None
+
+    def start(self) -> Scoring_job:
+        assert(self.thread is None)
+        self.thread = threading.Thread(target=self.run, name="scoring-job", daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self.cancelled.is_set()
+
+    def wait(self, timeout: float|None = None) -> bool:
+        return self.finished.wait(timeout)
+
+    def run(self):
+        try:
+            self.__run()
+        except Job_cancelled:
+            pass
+        except Exception as error:
+            self.__emit(self.on_error, error)
+        finally:
+            self.finished.set()
+
+    def __run(self):
+        self.__emit(self.on_progress, Scoring_job.Progress(self.MODEL_STAGE, 0, 1))
+        complete_model = self.get_model()
+        assert(isinstance(complete_model, AHP_complete_model))
+        self.__check()
+
+        model = complete_model.model
+        criteria = model.leaf_criteria
+        leaf_weights = complete_model.leaf_weights(self.calculator)
+        partial_scores = np.zeros(len(model.alternatives))
+        self.__emit(self.on_progress, Scoring_job.Progress(self.CRITERIA_STAGE, 0, len(criteria)))
+
+        for done, (criterion, weight) in enumerate(zip(criteria, leaf_weights), 1):
+            # Priorities land in the model cache, so the final ranking only sums them up
+            partial_scores = partial_scores + weight * complete_model.criterion_priorities(self.calculator, criterion)
+            koczkodaj = complete_model.koczkoaj_all([criterion])[criterion] if criterion not in model.rating_scales else None
+            self.__check()
+            self.__emit(self.on_criterion, Scoring_job.Criterion_result(criterion, koczkodaj, partial_scores))
+            self.__emit(self.on_progress, Scoring_job.Progress(self.CRITERIA_STAGE, done, len(criteria)))
+
+        ranking = complete_model.scores(self.calculator.name)
+        self.__check()
+        self.__emit(self.on_ranking, ranking)
+        self.__emit(self.on_progress, Scoring_job.Progress(self.RANKING_STAGE, 1, 1))
+
+    def __check(self):
+        if self.is_cancelled():
+            raise Job_cancelled()
+
+    def __emit(self, callback: Callable|None, value):
+        if callback is None or self.is_cancelled():
+            return
+        # Checked again on delivery, as a cancel may come while the callback is queued
+        self.dispatch(lambda: None if self.is_cancelled() else callback(value))
@@ -0,0 +1,126 @@
+from __future__ import annotations
+import json
+import os
+
+import numpy as np
+
+from AHP.ahp import Comparison_builder
+
+
+JOURNAL_VERSION = 1
+ANSWER_DTYPE = np.dtype([("matrix", "<u4"), ("i", "<u4"), ("j", "<u4"), ("value", "<f8")])
+INITIAL_CAPACITY = 64
+
+class Answer_journal:
+    def __init__(self, matrix_keys: list[tuple[str, str]], sizes: list[int], path: str|None = None, sync_on_append: bool = False):
+        assert(len(matrix_keys) == len(sizes))
+        self.matrix_keys = [tuple(key) for key in matrix_keys]
+        self.sizes = list(sizes)
+        self.matrix_ids = {key: i for i, key in enumerate(self.matrix_keys)}
+        self.path = path
+        self.sync_on_append = sync_on_append
+        self.answers = np.empty(INITIAL_CAPACITY, dtype=ANSWER_DTYPE)
+        self.count = 0
+        self.file = None
+        if path is not None:
+            self.__open()
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def entries(self) -> np.ndarray:
+        return self.answers[:self.count]
+
+    def append(self, matrix_key: tuple[str, str], i: int, j: int, value: float) -> Answer_journal:
+        matrix_id = self.matrix_ids[matrix_key]
+        assert(0 <= i < self.sizes[matrix_id] and 0 <= j < self.sizes[matrix_id] and i != j)
+        assert(value > 0)
+
+        if self.count == len(self.answers):
+            answers = np.empty(2 * len(self.answers), dtype=ANSWER_DTYPE)
+            answers[:self.count] = self.answers
+            self.answers = answers
+        self.answers[self.count] = (matrix_id, i, j, value)
+        if self.file is not None:
+            self.file.write(self.answers[self.count:self.count + 1].tobytes())
+            if self.sync_on_append:
+                self.sync()
+        self.count += 1
+        return self
+
+    def sync(self):
+        if self.file is None:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def clear(self):
+        self.count = 0
+        if self.file is not None:
+            self.file.truncate(self.header_size)
+            self.file.seek(self.header_size)
+            self.sync()
+
+    def close(self):
+        if self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
+
+    def latest(self) -> np.ndarray:
+        # One answer per unordered pair, the newest one, stored with i < j
+        entries = self.entries
+        swap = entries["i"] > entries["j"]
+        latest = np.empty(len(entries), dtype=ANSWER_DTYPE)
+        latest["matrix"] = entries["matrix"]
+        latest["i"] = np.where(swap, entries["j"], entries["i"])
+        latest["j"] = np.where(swap, entries["i"], entries["j"])
+        latest["value"] = np.where(swap, 1 / entries["value"], entries["value"])
+
+        order = np.lexsort((-np.arange(len(latest)), latest["j"], latest["i"], latest["matrix"]))
+        latest = latest[order]
+        first = np.ones(len(latest), dtype=bool)
+        first[1:] = (latest["matrix"][1:] != latest["matrix"][:-1]) | (latest["i"][1:] != latest["i"][:-1]) | (latest["j"][1:] != latest["j"][:-1])
+        return latest[first]
+
+    def replay(self) -> dict[tuple[str, str], np.ndarray]:
+        matrices = {}
+        for key, n in zip(self.matrix_keys, self.sizes):
+            matrix = np.full((n, n), Comparison_builder.UNINITIALIZED_MATRIX_VALUE)
+            np.fill_diagonal(matrix, 1.0)
+            matrices[key] = matrix
+
+        latest = self.latest()
+        for matrix_id in np.unique(latest["matrix"]):
+            answers = latest[latest["matrix"] == matrix_id]
+            matrix = matrices[self.matrix_keys[matrix_id]]
+            matrix[answers["i"], answers["j"]] = answers["value"]
+            matrix[answers["j"], answers["i"]] = 1 / answers["value"]
+        return matrices
+
+    def __get_header(self) -> bytes:
+        return (json.dumps({"version": JOURNAL_VERSION, "keys": [list(key) for key in self.matrix_keys], "sizes": self.sizes}) + "\n").encode()
+
+    def __open(self):
+        header = self.__get_header()
+        self.header_size = len(header)
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, 'rb') as f:
+                assert(f.readline() == header)
+            # A torn record from a crash mid-write is dropped, everything before it is intact
+            count = (os.path.getsize(self.path) - self.header_size) // ANSWER_DTYPE.itemsize
+            answers = np.fromfile(self.path, dtype=ANSWER_DTYPE, count=count, offset=self.header_size)
+            assert(np.all(answers["matrix"] < len(self.matrix_keys)))
+            self.answers = np.empty(max(INITIAL_CAPACITY, 2 * count), dtype=ANSWER_DTYPE)
+            self.answers[:count] = answers
+            self.count = count
+            self.file = open(self.path, 'r+b')
+            self.file.truncate(self.header_size + count * ANSWER_DTYPE.itemsize)
+            self.file.seek(0, os.SEEK_END)
+        else:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self.file = open(self.path, 'wb')
+            self.file.write(header)
+            self.sync()
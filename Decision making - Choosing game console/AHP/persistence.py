@@ -0,0 +1,105 @@
+from __future__ import annotations
+import csv
+import json
+import os
+
+import numpy as np
+
+from AHP.ahp import AHP_complete_model, AHP_model, Comparison_builder, Comparison_matrix
+
+
+FORMAT_VERSION = 2
+HEADER_FILE = "header.json"
+DATA_FILE = "data.npy"
+
+def save_model(model: AHP_model|AHP_complete_model, path: os.path):
+    complete_model = model if isinstance(model, AHP_complete_model) else model.complete_model
+    model = model.model if isinstance(model, AHP_complete_model) else model
+
+    # Every matrix and cached vector is packed into one flat float64 array, so loading
+    # is a single memory map and each matrix becomes a view into it.
+    chunks, offset = [], 0
+    def add_chunk(values: np.ndarray) -> list[int]:
+        nonlocal offset
+        chunks.append(np.ravel(values))
+        offset += np.size(values)
+        return [offset - np.size(values), offset]
+
+    matrices = []
+    for key in filter(model.has_matrix, model.matrix_keys()):
+        matrix = model.get_matrix(key)
+        matrices.append({"key": list(key), "labels": matrix.labels, "range": add_chunk(matrix.values)})
+
+    ratings = [{"criterion": criterion, "range": add_chunk(values)} for criterion, values in model.alternatives_ratings.items()]
+
+    priorities = []
+    if complete_model is not None:
+        # Only default calculators can be rebuilt from their name when the model is loaded
+        for name, cache in filter(lambda item: item[0] in AHP_complete_model.CALCULATORS, complete_model.priority_cache.items()):
+            priorities += [{"method": name, "key": list(key), "range": add_chunk(vector)} for key, vector in cache.items()]
+
+    header = {
+        "version": FORMAT_VERSION,
+        "criteria": model.criteria,
+        "sub_criteria": model.sub_criteria,
+        "alternatives": model.alternatives,
+        "rating_scales": model.rating_scales,
+        "matrices": matrices,
+        "ratings": ratings,
+        "priorities": priorities,
+    }
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, DATA_FILE), np.concatenate(chunks) if chunks else np.empty(0))
+    with open(os.path.join(path, HEADER_FILE), 'w') as f:
+        json.dump(header, f)
+
+def load_model(path: os.path, mmap_mode: str|None = "r") -> AHP_model|AHP_complete_model:
+    with open(os.path.join(path, HEADER_FILE), 'r') as f:
+        header = json.load(f)
+    assert(header["version"] <= FORMAT_VERSION)
+    data = np.load(os.path.join(path, DATA_FILE), mmap_mode=mmap_mode)
+    get_range = lambda entry: data[entry["range"][0]:entry["range"][1]]
+
+    model = AHP_model(header["criteria"], header["sub_criteria"], header["alternatives"], header.get("rating_scales", {}))
+    for entry in header["matrices"]:
+        labels = entry["labels"]
+        model = model.add_comparison_matrix(tuple(entry["key"]), Comparison_matrix(labels, get_range(entry).reshape(len(labels), len(labels))))
+    for entry in header.get("ratings", []):
+        model = model.add_alternatives_ratings(entry["criterion"], get_range(entry))
+
+    if isinstance(model, AHP_complete_model):
+        for entry in header["priorities"]:
+            model.priority_cache.setdefault(entry["method"], {})[tuple(entry["key"])] = get_range(entry)
+    return model
+
+def get_csv_name(matrix_key: tuple[str, str]) -> str:
+    kind, criterion = matrix_key
+    return (kind if not criterion else kind + "-" + criterion) + ".csv"
+
+def write_comparison_csv_directory(model: AHP_model|AHP_complete_model, path: os.path):
+    model = model.model if isinstance(model, AHP_complete_model) else model
+    os.makedirs(path, exist_ok=True)
+    for key in filter(model.has_matrix, model.matrix_keys()):
+        labels = model.get_matrix_labels(key)
+        values = model.get_matrix(key).values_in_order(labels)
+        with open(os.path.join(path, get_csv_name(key)), 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow([""] + labels)
+            writer.writerows([label] + ["" if value == Comparison_builder.UNINITIALIZED_MATRIX_VALUE else repr(float(value)) for value in row] for label, row in zip(labels, values))
+
+def read_comparison_csv_directory(model: AHP_model, path: os.path) -> dict[tuple[str, str], np.ndarray]:
+    matrices = {}
+    for key in model.matrix_keys():
+        file_path = os.path.join(path, get_csv_name(key))
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, 'r', newline='') as f:
+            header, *rows = list(csv.reader(f))
+        labels = header[1:]
+        values = np.array([[float(cell) if cell else Comparison_builder.UNINITIALIZED_MATRIX_VALUE for cell in row[1:]] for row in rows])
+        assert([row[0] for row in rows] == labels)
+        matrices[key] = Comparison_matrix(labels, values).values_in_order(model.get_matrix_labels(key))
+    return matrices
+
+def load_comparison_csv_directory(model: AHP_model, path: os.path) -> AHP_model|AHP_complete_model:
+    return model.add_comparison_values(read_comparison_csv_directory(model, path))
@@ -0,0 +1,120 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Callable, Iterator
+import functools
+import json
+import threading
+import time
+
+
+class Stage_stats:
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.sizes = {}
+
+    def add(self, calls: int, seconds: float, sizes: dict[int, int]):
+        self.calls += calls
+        self.seconds += seconds
+        for size, count in sizes.items():
+            self.sizes[size] = self.sizes.get(size, 0) + count
+
+    def to_dict(self) -> dict:
+        return {"calls": self.calls, "seconds": self.seconds, "sizes": {str(size): count for size, count in sorted(self.sizes.items())}}
+
+class Profiler:
+    SEPARATOR = ";"
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stages = {}
+            # Exclusive time per call path, which is what flame graphs stack up
+            self.self_seconds = {}
+
+    def enable(self) -> Profiler:
+        self.enabled = True
+        return self
+
+    def disable(self) -> Profiler:
+        self.enabled = False
+        return self
+
+    @contextmanager
+    def profile(self) -> Iterator[Profiler]:
+        enabled, self.enabled = self.enabled, True
+        try:
+            yield self
+        finally:
+            self.enabled = enabled
+
+    @contextmanager
+    def stage(self, name: str, size: int|None = None) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        stack = self.__get_stack()
+        frame = [name, 0.0]
+        stack.append(frame)
+        path = self.SEPARATOR.join(frame_name for frame_name, _ in stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+            with self.lock:
+                self.stages.setdefault(name, Stage_stats()).add(1, elapsed, {size: 1} if size is not None else {})
+                self.self_seconds[path] = self.self_seconds.get(path, 0.0) + elapsed - frame[1]
+
+    def add(self, report: dict) -> Profiler:
+        with self.lock:
+            for name, stats in report["stages"].items():
+                self.stages.setdefault(name, Stage_stats()).add(stats["calls"], stats["seconds"], {int(size): count for size, count in stats["sizes"].items()})
+            for path, seconds in report["self_seconds"].items():
+                self.self_seconds[path] = self.self_seconds.get(path, 0.0) + seconds
+        return self
+
+    def to_dict(self) -> dict:
+        with self.lock:
+            return {"stages": {name: stats.to_dict() for name, stats in self.stages.items()}, "self_seconds": dict(self.self_seconds)}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=1)
+
+    def to_folded(self) -> str:
+        # One "stage;stage;stage microseconds" line per path, as read by flamegraph.pl and speedscope
+        with self.lock:
+            lines = [f"{path} {round(seconds * 1e6)}" for path, seconds in sorted(self.self_seconds.items())]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write(self, path: str):
+        with open(path, 'w') as f:
+            f.write(self.to_folded() if path.endswith(".folded") else self.to_json())
+
+    def __get_stack(self) -> list[list]:
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+profiler = Profiler()
+
+def profiled(name: str|Callable[..., str], size: Callable[..., int]|None = None):
+    def decorate(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return function(*args, **kwargs)
+            stage_name = name(*args, **kwargs) if callable(name) else name
+            with profiler.stage(stage_name, size(*args, **kwargs) if size is not None else None):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
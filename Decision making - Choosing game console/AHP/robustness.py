@@ -0,0 +1,109 @@
+from __future__ import annotations
+from typing import NamedTuple
+
+import numpy as np
+
+from AHP.ahp import (
+    AHP_complete_model, Criteria_hierarchy, MAX_COMPARISON_VALUE, ALTERNATIVES_MATRIX, CRITERIA_MATRIX, SUB_CRITERIA_MATRIX,
+    complete_with_ratios, llsm_batch, stack_comparison_matrices,
+)
+
+
+SHARD_SAMPLES = 4096
+CHUNK_ELEMENTS = 1 << 22
+
+class Simulation_problem(NamedTuple):
+    alternatives_logs: np.ndarray
+    # The criteria matrix followed by every sub-criteria matrix, in hierarchy node order
+    hierarchy_logs: list[np.ndarray]
+    hierarchy: Criteria_hierarchy
+    baseline_ranks: np.ndarray
+
+def completed_logs(stack: np.ndarray) -> np.ndarray:
+    # Missing judgments are filled with the LLSM ratios, so they are perturbed like any other cell
+    return np.log(complete_with_ratios(stack, llsm_batch(stack)) if np.any(stack <= 0) else stack)
+
+def perturb(logs: np.ndarray, samples: int, sigma: float, clip: bool, rng: np.random.Generator) -> np.ndarray:
+    noise = np.triu(rng.normal(0.0, sigma, (samples,) + logs.shape), 1)
+    perturbed = logs + noise - noise.swapaxes(-1, -2)
+    if clip:
+        bound = np.log(MAX_COMPARISON_VALUE)
+        np.clip(perturbed, -bound, bound, out=perturbed)
+    return perturbed
+
+def perturbed_priorities(logs: np.ndarray, samples: int, sigma: float, clip: bool, rng: np.random.Generator, calculator: AHP_complete_model.Matrix_priority_calculator) -> np.ndarray:
+    perturbed = perturb(logs, samples, sigma, clip, rng)
+    if calculator.name == AHP_complete_model.GMM_calculator.name:
+        log_means = perturbed.mean(axis=-1)
+        gm_rows = np.exp(log_means - log_means.max(axis=-1, keepdims=True))
+        return gm_rows / gm_rows.sum(axis=-1, keepdims=True)
+    flat = calculator.calculate_batch(np.exp(perturbed).reshape((-1,) + logs.shape[-2:]))
+    return flat.reshape(perturbed.shape[:-1])
+
+def simulate_shard(problem: Simulation_problem, samples: int, sigma: float, clip: bool, seed: np.random.SeedSequence, calculator: AHP_complete_model.Matrix_priority_calculator) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    count, n = problem.alternatives_logs.shape[0], problem.alternatives_logs.shape[-1]
+    rank_counts = np.zeros((n, n), dtype=np.int64)
+    chunk = max(1, CHUNK_ELEMENTS // max(1, count * n * n))
+
+    for start in range(0, samples, chunk):
+        size = min(chunk, samples - start)
+        alternatives_priorities = perturbed_priorities(problem.alternatives_logs, size, sigma, clip, rng, calculator)
+        local_priorities = np.concatenate([perturbed_priorities(logs, size, sigma, clip, rng, calculator) for logs in problem.hierarchy_logs], axis=1)
+
+        leaf_weights = problem.hierarchy.leaf_weights(local_priorities)
+        scores = np.einsum("skn,sk->sn", alternatives_priorities, leaf_weights)
+        ranks = np.argsort(np.argsort(-scores, axis=1), axis=1)
+        rank_counts += np.bincount((np.arange(n) * n + ranks).ravel(), minlength=n * n).reshape(n, n)
+
+    return rank_counts
+
+class Robustness_analysis:
+    class Result(NamedTuple):
+        samples: int
+        rank_probabilities: np.ndarray
+        top_probability: dict[str, float]
+        same_rank_probability: dict[str, float]
+
+    def __init__(self, complete_model: AHP_complete_model, calculator: AHP_complete_model.Matrix_priority_calculator|None = None):
+        self.calculator = calculator or AHP_complete_model.GMM_calculator()
+        model = complete_model.model
+        # Perturbation is defined on pairwise judgments, rated criteria have none for the alternatives
+        assert(not model.rating_scales)
+        self.alternatives = model.alternatives
+
+        get_logs = lambda matrix_key: completed_logs(model.get_matrix(matrix_key).values_in_order(model.get_matrix_labels(matrix_key)))
+        baseline = complete_model.alternatives_priorities([self.calculator])[0] @ complete_model.leaf_weights(self.calculator)
+        self.problem = Simulation_problem(
+            completed_logs(stack_comparison_matrices([model.get_matrix((ALTERNATIVES_MATRIX, criterion)) for criterion in model.leaf_criteria], model.alternatives)),
+            [get_logs((CRITERIA_MATRIX, ""))] + [get_logs((SUB_CRITERIA_MATRIX, criterion)) for criterion in model.sub_criteria],
+            model.hierarchy,
+            np.argsort(np.argsort(-baseline)),
+        )
+
+    def simulate(self, samples: int, sigma: float = 0.2, clip: bool = True, seed: int|None = None, workers: int|None = None) -> Robustness_analysis.Result:
+        assert(samples > 0)
+        assert(sigma >= 0)
+
+        # Shards are fixed-size and seeded independently, so results only depend on the seed, never on workers
+        shard_sizes = [min(SHARD_SAMPLES, samples - start) for start in range(0, samples, SHARD_SAMPLES)]
+        seeds = np.random.SeedSequence(seed).spawn(len(shard_sizes))
+        arguments = (
+            [self.problem] * len(shard_sizes), shard_sizes, [sigma] * len(shard_sizes),
+            [clip] * len(shard_sizes), seeds, [self.calculator] * len(shard_sizes),
+        )
+        if workers is not None and len(shard_sizes) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(workers) as executor:
+                rank_counts = sum(executor.map(simulate_shard, *arguments))
+        else:
+            rank_counts = sum(map(simulate_shard, *arguments))
+
+        rank_probabilities = rank_counts / samples
+        baseline_ranks = self.problem.baseline_ranks
+        return Robustness_analysis.Result(
+            samples,
+            rank_probabilities,
+            dict(zip(self.alternatives, map(float, rank_probabilities[:, 0]))),
+            dict(zip(self.alternatives, map(float, rank_probabilities[np.arange(len(self.alternatives)), baseline_ranks]))),
+        )
@@ -0,0 +1,77 @@
+from __future__ import annotations
+import math
+
+import numpy as np
+
+from AHP.ahp import Comparison_builder, Comparison_matrix, is_connected, llsm_batch
+
+
+class Adaptive_pair_scheduler:
+    RANK_DISTANCES = (1, 2)
+
+    def __init__(self, labels: list[str], patience: int|None = None, max_questions: int|None = None):
+        n = len(labels)
+        self.labels = list(labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.matrix = Comparison_matrix.filled(self.labels, Comparison_builder.UNINITIALIZED_MATRIX_VALUE)
+        self.asked = np.eye(n, dtype=bool)
+        self.questions = 0
+        self.patience = patience if patience is not None else max(2, math.ceil(math.log2(max(n, 2))))
+        self.max_questions = max_questions if max_questions is not None else n * (n - 1) // 2
+        self.connected = n <= 1
+        self.stable = 0
+        self.ranking = np.arange(n)
+        self.priorities = np.full(n, 1 / max(n, 1))
+
+    def next_pair(self) -> tuple[str, str]|None:
+        pairs = self.upcoming_pairs(1)
+        return pairs[0] if pairs else None
+
+    def upcoming_pairs(self, count: int) -> list[tuple[str, str]]:
+        if self.is_finished():
+            return []
+        if not self.connected:
+            # Chain through the labels first, so every answer afterwards refines a solvable model
+            gaps = [q for q in range(len(self.labels) - 1) if not self.asked[q, q + 1]][:count]
+            return [(self.labels[gap], self.labels[gap + 1]) for gap in gaps]
+
+        candidates = self.__candidates()
+        first, second = candidates[:, 0], candidates[:, 1]
+        degrees = self.asked.sum(axis=1) - 1
+        uncertainty = 1 / degrees[first] + 1 / degrees[second]
+        closeness = np.abs(np.log(self.priorities[first]) - np.log(self.priorities[second])) + 0.1
+        best = np.argsort(-(uncertainty / closeness), kind="stable")[:count]
+        return [(self.labels[first[index]], self.labels[second[index]]) for index in best]
+
+    def answer(self, first: str, second: str, value: float) -> Adaptive_pair_scheduler:
+        assert(value > 0)
+        assert(first != second)
+
+        i, j = self.index[first], self.index[second]
+        self.matrix.values[i, j] = value
+        self.matrix.values[j, i] = 1 / value
+        if not self.asked[i, j]:
+            self.asked[i, j] = self.asked[j, i] = True
+            self.questions += 1
+
+        self.connected = self.connected or is_connected(self.asked)
+        if self.connected:
+            self.priorities = llsm_batch(self.matrix.values[np.newaxis])[0]
+            ranking = np.argsort(-self.priorities, kind="stable")
+            self.stable = self.stable + 1 if np.array_equal(ranking, self.ranking) else 0
+            self.ranking = ranking
+        return self
+
+    def is_finished(self) -> bool:
+        return (
+            self.questions >= self.max_questions or
+            (self.connected and self.stable >= self.patience) or
+            (self.connected and len(self.__candidates()) == 0)
+        )
+
+    def get_ranking(self) -> list[str]:
+        return [self.labels[index] for index in self.ranking]
+
+    def __candidates(self) -> np.ndarray:
+        pairs = np.concatenate([np.stack((self.ranking[:-distance], self.ranking[distance:]), axis=1) for distance in self.RANK_DISTANCES if distance < len(self.labels)] or [np.empty((0, 2), dtype=np.intp)])
+        return pairs[~self.asked[pairs[:, 0], pairs[:, 1]]]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+from typing import NamedTuple
+
+import numpy as np
+
+from AHP.ahp import AHP_complete_model, CRITERIA_MATRIX
+
+
+PARALLEL_GRID_CHUNK = 1 << 16
+
+def score_weights(weights: np.ndarray, contributions: np.ndarray) -> np.ndarray:
+    return weights @ contributions.T
+
+class Sensitivity_analysis:
+    class Sweep_result(NamedTuple):
+        weights: np.ndarray
+        scores: np.ndarray
+        top: np.ndarray
+
+    class Rank_reversal(NamedTuple):
+        criterion: str
+        weight: float
+        lower: float|None
+        lower_alternative: str|None
+        upper: float|None
+        upper_alternative: str|None
+
+    def __init__(self, complete_model: AHP_complete_model, calculator: AHP_complete_model.Matrix_priority_calculator|None = None):
+        calculator = calculator or AHP_complete_model.GMM_calculator()
+        model = complete_model.model
+        self.alternatives = model.alternatives
+        self.criteria = model.criteria
+        self.criteria_weights = complete_model.matrix_priorities(calculator, (CRITERIA_MATRIX, ""))
+
+        # contributions[a, c] is what criterion c adds to alternative a per unit of its weight
+        leaf_to_criteria = np.zeros((len(model.leaf_criteria), len(model.criteria)))
+        leaf_to_criteria[np.arange(len(model.leaf_criteria)), model.leaf_root_index] = complete_model.local_leaf_priorities(calculator)
+        self.contributions = complete_model.alternatives_priorities([calculator])[0] @ leaf_to_criteria
+        self.scores = self.contributions @ self.criteria_weights
+
+    def sweep_weights(self, criteria: list[str], grid: np.ndarray, workers: int|None = None) -> Sensitivity_analysis.Sweep_result:
+        assert(0 < len(criteria) < len(self.criteria))
+
+        swept = np.array([self.criteria.index(criterion) for criterion in criteria])
+        points = np.stack(np.meshgrid(*[np.asarray(grid, dtype=np.float64)] * len(criteria), indexing="ij"), axis=-1).reshape(-1, len(criteria))
+        points = points[points.sum(axis=1) <= 1 + 1e-12]
+
+        rest = np.ones(len(self.criteria), dtype=bool)
+        rest[swept] = False
+        weights = np.empty((len(points), len(self.criteria)))
+        weights[:, swept] = points
+        weights[:, rest] = np.outer(1 - points.sum(axis=1), self.criteria_weights[rest] / self.criteria_weights[rest].sum())
+
+        if workers is not None and len(weights) > PARALLEL_GRID_CHUNK:
+            from concurrent.futures import ProcessPoolExecutor
+            chunks = np.array_split(weights, -(-len(weights) // PARALLEL_GRID_CHUNK))
+            with ProcessPoolExecutor(workers) as executor:
+                scores = np.concatenate(list(executor.map(score_weights, chunks, [self.contributions] * len(chunks))))
+        else:
+            scores = score_weights(weights, self.contributions)
+
+        return Sensitivity_analysis.Sweep_result(weights, scores, np.argmax(scores, axis=1))
+
+    def rank_reversals(self) -> list[Sensitivity_analysis.Rank_reversal]:
+        return [self.rank_reversal(criterion) for criterion in self.criteria]
+
+    def rank_reversal(self, criterion: str) -> Sensitivity_analysis.Rank_reversal:
+        index = self.criteria.index(criterion)
+        weight = float(self.criteria_weights[index])
+        top = int(np.argmax(self.scores))
+        if len(self.criteria) == 1:
+            return Sensitivity_analysis.Rank_reversal(criterion, weight, None, None, None, None)
+
+        # With the other weights renormalized, every score is linear in the swept weight t:
+        # score(t) = intercept + slope * t, so the top changes where two lines cross.
+        intercept = (self.scores - weight * self.contributions[:, index]) / (1 - weight)
+        slope = self.contributions[:, index] - intercept
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossings = (intercept - intercept[top]) / (slope[top] - slope)
+        crossings[top] = np.nan
+        crossings[~np.isfinite(crossings) | (crossings < 0) | (crossings > 1)] = np.nan
+
+        below = np.where(crossings < weight, crossings, np.nan)
+        above = np.where(crossings > weight, crossings, np.nan)
+        get_alternative = lambda candidates, pick: self.alternatives[int(pick(candidates))] if not np.all(np.isnan(candidates)) else None
+        get_threshold = lambda candidates, pick: float(candidates[int(pick(candidates))]) if not np.all(np.isnan(candidates)) else None
+
+        return Sensitivity_analysis.Rank_reversal(
+            criterion, weight,
+            get_threshold(below, np.nanargmax), get_alternative(below, np.nanargmax),
+            get_threshold(above, np.nanargmin), get_alternative(above, np.nanargmin),
+        )
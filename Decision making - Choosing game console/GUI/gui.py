@@ -1,33 +1,20 @@
+import hashlib
 import itertools
 import os
 import pathlib
+from functools import cached_property
 
 from kivy.config import Config
-from kivy.core.window import Window
-from kivy.lang.builder import Builder
-from kivy.properties import StringProperty
-from kivy.uix.label import Label
+from kivy.properties import ObjectProperty, StringProperty
 from kivy.uix.screenmanager import Screen, ScreenManager
 from kivymd.app import MDApp
-from sugestator_to_model import SugestatorToModel
 
 Config.set("input", "mouse", "mouse,disable_multitouch")
 
 file_path = str(pathlib.Path(__file__).parent.resolve())
 
-sugestator_to_model = SugestatorToModel(os.path.join("Data", "alternatives.txt"), os.path.join("Data", "criteria.txt"))
-
-alternatives = sugestator_to_model.alternatives
-criteria = sugestator_to_model.get_criteria_to_choose()
-
 images_path = os.path.join(file_path, "Images")
 
-alternatives_images_links = {alternative: alternative.replace(" ", "_") + ".png" for alternative in alternatives}
-
-alternatives_combinations = list(itertools.combinations(alternatives, 2))
-
-criteria_and_subcriteria_combinations = sugestator_to_model.get_criteria_and_subcriteria_combinations()
-
 methods_parser = {0: "GMM", 1: "EVM", 2: "Simple Column", 3: "Simple Scaled Column"}
 
 
@@ -45,7 +32,62 @@ def mapping_function(val: int):
             return 9
 
 
-sugestator_to_model.set_mapping_function(mapping_function)
+def get_journal_path(data_paths: list[str]) -> str:
+    # Named after the data files, so answers only resume for the alternatives and criteria they were given for
+    digest = hashlib.sha1()
+    for path in data_paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    state_path = os.environ.get("XDG_STATE_HOME", os.path.expanduser(os.path.join("~", ".local", "state")))
+    return os.path.join(state_path, "ahp", f"answers-{digest.hexdigest()[:16]}.journal")
+
+
+class Session:
+    # Data files and the model are only read when the first screen asks for them
+    @cached_property
+    def sugestator_to_model(self):
+        from sugestator_to_model import SugestatorToModel
+
+        data_paths = [os.path.join("Data", "alternatives.txt"), os.path.join("Data", "criteria.txt")]
+        sugestator_to_model = SugestatorToModel(*data_paths, get_journal_path(data_paths))
+        sugestator_to_model.set_mapping_function(mapping_function)
+        return sugestator_to_model
+
+    @cached_property
+    def alternatives(self):
+        return self.sugestator_to_model.alternatives
+
+    @cached_property
+    def criteria(self):
+        return self.sugestator_to_model.get_criteria_to_choose()
+
+    @cached_property
+    def alternatives_images_links(self):
+        return {alternative: os.path.join(images_path, alternative.replace(" ", "_") + ".png") for alternative in self.alternatives}
+
+    @cached_property
+    def image_cache(self):
+        from GUI.image_cache import Texture_cache
+
+        return Texture_cache()
+
+    @cached_property
+    def alternatives_combinations(self):
+        return list(itertools.combinations(self.alternatives, 2))
+
+    @cached_property
+    def criteria_and_subcriteria_combinations(self):
+        return self.sugestator_to_model.get_criteria_and_subcriteria_combinations()
+
+    def close(self):
+        # Only what was actually opened, closing must not load the model
+        if "sugestator_to_model" in self.__dict__:
+            self.sugestator_to_model.close()
+        if "image_cache" in self.__dict__:
+            self.image_cache.close()
+
+
+session = Session()
 
 
 class WelcomeScreen(Screen):
@@ -55,43 +97,54 @@ class WelcomeScreen(Screen):
 class MainScreen(Screen):
     curr_val = 0
     curr_criterion_index = 0
-    curr_alternatives_index = 0
-
-    criteria_count = len(criteria)
-    alternatives_combinations_count = len(alternatives_combinations)
-
-    curr_criterion = StringProperty(criteria[curr_criterion_index])
-    left_text = StringProperty(alternatives_combinations[curr_alternatives_index][0])
-    right_text = StringProperty(alternatives_combinations[curr_alternatives_index][1])
-    left_image_link = StringProperty(
-        os.path.join(images_path, alternatives_images_links[alternatives_combinations[curr_alternatives_index][0]]))
-    right_image_link = StringProperty(
-        os.path.join(images_path, alternatives_images_links[alternatives_combinations[curr_alternatives_index][1]]))
+    needs_question = True
+
+    curr_criterion = StringProperty("")
+    left_text = StringProperty("")
+    right_text = StringProperty("")
+    left_texture = ObjectProperty(None, allownone=True)
+    right_texture = ObjectProperty(None, allownone=True)
+    prefetched_pairs = 3
+
+    def on_pre_enter(self, *args):
+        if self.needs_question:
+            self.needs_question = False
+            self.curr_criterion_index = 0
+            # A resumed session may have finished some criteria already
+            self.change_question()
 
     def set_curr_val(self, val):
         self.curr_val = val
 
     def confirm_answer(self):
-        sugestator_to_model.add_partial_comparision(self.left_text, self.right_text, self.curr_criterion, self.curr_val)
+        session.sugestator_to_model.add_partial_comparision(self.left_text, self.right_text, self.curr_criterion, self.curr_val)
+        session.sugestator_to_model.sync()
         self.change_question()
 
     def change_question(self):
-        if self.curr_alternatives_index >= self.alternatives_combinations_count - 1:
-            if self.curr_criterion_index >= self.criteria_count - 1:
-                self.curr_criterion_index = 0
-                self.curr_alternatives_index = 0
+        next_pair = session.sugestator_to_model.next_alternatives_pair(session.criteria[self.curr_criterion_index])
+        while next_pair is None:
+            if self.curr_criterion_index >= len(session.criteria) - 1:
+                self.needs_question = True
                 self.manager.current = "criteria_screen"
-            else:
-                self.curr_criterion_index += 1
-                self.curr_alternatives_index = 0
-        else:
-            self.curr_alternatives_index += 1
+                return
+            self.curr_criterion_index += 1
+            next_pair = session.sugestator_to_model.next_alternatives_pair(session.criteria[self.curr_criterion_index])
+
+        self.show_question(next_pair)
 
-        self.curr_criterion = criteria[self.curr_criterion_index]
-        self.left_text = alternatives_combinations[self.curr_alternatives_index][0]
-        self.right_text = alternatives_combinations[self.curr_alternatives_index][1]
-        self.left_image_link = os.path.join(images_path, alternatives_images_links[self.left_text])
-        self.right_image_link = os.path.join(images_path, alternatives_images_links[self.right_text])
+    def show_question(self, pair):
+        self.curr_criterion = session.criteria[self.curr_criterion_index]
+        self.left_text, self.right_text = pair
+        self.left_texture = session.image_cache.get(session.alternatives_images_links[self.left_text])
+        self.right_texture = session.image_cache.get(session.alternatives_images_links[self.right_text])
+        self.prefetch_images()
+
+    def prefetch_images(self):
+        upcoming = session.sugestator_to_model.upcoming_alternatives_pairs(self.curr_criterion, self.prefetched_pairs + 1)[1:]
+        for criterion in session.criteria[self.curr_criterion_index + 1:self.curr_criterion_index + 2]:
+            upcoming += session.sugestator_to_model.upcoming_alternatives_pairs(criterion, 1)
+        session.image_cache.prefetch([session.alternatives_images_links[alternative] for pair in upcoming for alternative in pair])
 
 
 class SettingsScreen(Screen):
@@ -101,60 +154,129 @@ class SettingsScreen(Screen):
 class CriteriaScreen(Screen):
     curr_val = 0
     curr_criterion_index = 0
+    needs_question = True
 
-    criteria_combinations_count = len(criteria_and_subcriteria_combinations)
+    left_text = StringProperty("")
+    right_text = StringProperty("")
 
-    left_text = StringProperty(criteria_and_subcriteria_combinations[curr_criterion_index][0])
-    right_text = StringProperty(criteria_and_subcriteria_combinations[curr_criterion_index][1])
+    def on_pre_enter(self, *args):
+        if self.needs_question:
+            self.needs_question = False
+            self.curr_criterion_index = 0
+            self.show_question()
 
     def set_curr_val(self, val):
         self.curr_val = val
 
     def confirm_answer(self):
-        sugestator_to_model.add_partial_cryteria_comparision(self.left_text, self.right_text, self.curr_val)
+        session.sugestator_to_model.add_partial_cryteria_comparision(self.left_text, self.right_text, self.curr_val)
+        session.sugestator_to_model.sync()
         self.change_question()
 
     def change_question(self):
-        if self.curr_criterion_index >= self.criteria_combinations_count - 1:
-            self.curr_criterion_index = 0
-
-            complete_model = sugestator_to_model.load_comparisions_value_into_model()
+        if self.curr_criterion_index >= len(session.criteria_and_subcriteria_combinations) - 1:
+            self.needs_question = True
 
-            self.manager.get_screen('results_screen').generate_result_view(complete_model)
+            # Answers are copied here, the worker thread only builds and scores the model
+            model, matrices = session.sugestator_to_model.model, session.sugestator_to_model.get_comparision_matrices()
+            self.manager.get_screen('results_screen').start_scoring(lambda: model.add_comparison_values(matrices))
             self.manager.current = "results_screen"
 
         else:
             self.curr_criterion_index += 1
+            self.show_question()
+
+    def show_question(self):
+        self.left_text, self.right_text = session.criteria_and_subcriteria_combinations[self.curr_criterion_index]
+
+
+class Ranked_rows:
+    PAGE_SIZE = 50
 
-        self.left_text = criteria_and_subcriteria_combinations[self.curr_criterion_index][0]
-        self.right_text = criteria_and_subcriteria_combinations[self.curr_criterion_index][1]
+    def __init__(self, view):
+        self.view = view
+        self.clear()
+
+    def clear(self):
+        self.labels, self.values, self.order = [], [], []
+        self.view.data = []
+
+    def show(self, labels: list[str], values):
+        import numpy as np
+
+        self.labels, self.values = labels, np.asarray(values)
+        self.order = []
+        self.view.data = []
+        self.load_more()
+
+    def load_more(self):
+        from AHP.ahp import top_k_indices
+
+        if len(self.order) >= len(self.values):
+            return
+        order = top_k_indices(self.values, len(self.order) + self.PAGE_SIZE)
+        self.view.data.extend({"text": self.labels[index] + "  ---  " + str(float(self.values[index]))} for index in order[len(self.order):])
+        self.order = order
 
 
 class ResultsScreen(Screen):
+    job = None
+    progress_text = StringProperty("")
+
+    def on_kv_post(self, base_widget):
+        self.scores_rows = Ranked_rows(self.ids.left_scroll_view)
+        self.koczkodaj_rows = Ranked_rows(self.ids.right_scroll_view)
+
+    def start_scoring(self, get_model):
+        from kivy.clock import Clock
+        from AHP.jobs import Scoring_job
+
+        self.cancel_scoring()
+        self.clear_result_view()
+        self.koczkodaj_values = {}
+        self.job = Scoring_job(
+            get_model, methods_parser[self.manager.used_method],
+            on_progress=self.show_progress,
+            on_criterion=self.add_criterion_result,
+            on_ranking=self.show_ranking,
+            on_error=self.show_error,
+            dispatch=lambda callback: Clock.schedule_once(lambda dt: callback()),
+        ).start()
+
+    def cancel_scoring(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+        self.progress_text = ""
+
+    def clear_result_view(self):
+        self.scores_rows.clear()
+        self.koczkodaj_rows.clear()
+
+    def show_progress(self, progress):
+        if progress.stage == "model":
+            self.progress_text = "Building the model..."
+        elif progress.stage == "criteria":
+            self.progress_text = f"Calculating criteria: {progress.done}/{progress.total}"
+        else:
+            self.progress_text = ""
+
+    def add_criterion_result(self, result):
+        self.scores_rows.show(session.alternatives, result.partial_scores)
 
-    def generate_result_view(self, complete_model):
-        results = self.calculate_result(complete_model)
-        results = dict(sorted(results.items(), key=lambda item: item[1], reverse=True))
+        if result.koczkodaj is not None:
+            self.koczkodaj_values[result.criterion] = result.koczkodaj.value
+            self.koczkodaj_rows.show(list(self.koczkodaj_values), list(self.koczkodaj_values.values()))
 
-        for key in results:
-            lbl = Label(text=key + "  ---  " + str(results[key]), size_hint_y=None, color=(0, 0, 0, 1))
-            self.ids.left_scroll_view.add_widget(lbl)
+    def show_ranking(self, ranking):
+        self.scores_rows.show(session.alternatives, ranking)
 
-        sorted_koczkodaj = {criterion: complete_model.koczkoaj(criterion) for criterion in criteria}
-        sorted_koczkodaj = dict(sorted(sorted_koczkodaj.items(), key=lambda item: item[1], reverse=True))
-        for key in sorted_koczkodaj:
-            lbl2 = Label(text=key + "  ---  " + str(sorted_koczkodaj[key]), size_hint_y=None, color=(0, 0, 0, 1))
-            self.ids.right_scroll_view.add_widget(lbl2)
+    def show_error(self, error):
+        self.progress_text = "Calculation failed: " + str(error)
 
-    def calculate_result(self, complete_model):
-        if self.manager.used_method == 0:
-            return complete_model.calculate_gmm()
-        if self.manager.used_method == 1:
-            return complete_model.calculate_evm()
-        if self.manager.used_method == 2:
-            return complete_model.calculate_simple_column()
-        if self.manager.used_method == 3:
-            return complete_model.calculate_simple_scaled_column()
+    def load_more_rows(self, view):
+        if view.scroll_y <= 0.05:
+            (self.scores_rows if view is self.ids.left_scroll_view else self.koczkodaj_rows).load_more()
 
 
 class WindowManager(ScreenManager):
@@ -167,6 +289,8 @@ class WindowManager(ScreenManager):
     used_method_name = StringProperty("GMM")    # defaults to GMM
 
     def screen_mode_change(self):
+        from kivy.core.window import Window
+
         if Window.fullscreen:
             Window.fullscreen = False
             self.screen_mode_change_image_link = os.path.join(images_path, "fullscreen_maximize.png")
@@ -179,15 +303,23 @@ class WindowManager(ScreenManager):
         self.used_method_name = methods_parser[var]
 
     def reinitialize_model(self):
-        sugestator_to_model.reset()
-        self.get_screen('results_screen').ids.left_scroll_view.clear_widgets()
-        self.get_screen('results_screen').ids.right_scroll_view.clear_widgets()
+        self.get_screen('results_screen').cancel_scoring()
+        self.get_screen('results_screen').clear_result_view()
+        session.sugestator_to_model.reset()
+        self.get_screen('main_screen').needs_question = True
+        self.get_screen('criteria_screen').needs_question = True
 
 
 class Gui(MDApp):
     def build(self):
+        from kivy.core.window import Window
+        from kivy.lang.builder import Builder
+
         Window.minimum_width = 640
         Window.minimum_height = 360
         self.icon = file_path + "Images//logo_maybe.png"
         self.title = "Decision making - Choosing game console"
         return Builder.load_file(os.path.join(file_path, "gui.kv"))
+
+    def on_stop(self):
+        session.close()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, NamedTuple
+import math
+
+import numpy as np
+
+
+class Decoded_image(NamedTuple):
+    pixels: np.ndarray
+    colorfmt: str
+    flip_vertical: bool
+
+def downscale(pixels: np.ndarray, max_size: tuple[int, int]) -> np.ndarray:
+    # Box filter by a whole factor, so every output pixel averages a full block
+    height, width = pixels.shape[:2]
+    factor = max(1, math.ceil(max(width / max_size[0], height / max_size[1])))
+    if factor == 1:
+        return pixels
+    height, width = height // factor, width // factor
+    blocks = pixels[:height * factor, :width * factor].reshape(height, factor, width, factor, -1)
+    return np.round(blocks.mean(axis=(1, 3), dtype=np.float32)).astype(pixels.dtype)
+
+def decode_image(path: str, max_size: tuple[int, int]) -> Decoded_image:
+    from kivy.core.image import ImageLoader
+
+    # Only decoding happens here, as textures must be created on the main thread
+    image = ImageLoader.load(path, keep_data=True, nocache=True)._data[0]
+    channels = len(image.fmt)
+    row_length = image.rowlength or image.width * channels
+    pixels = np.frombuffer(image.data, dtype=np.uint8).reshape(image.height, row_length)[:, :image.width * channels]
+    return Decoded_image(downscale(pixels.reshape(image.height, image.width, channels), max_size), image.fmt, image.flip_vertical)
+
+def create_texture(image: Decoded_image):
+    from kivy.graphics.texture import Texture
+
+    height, width = image.pixels.shape[:2]
+    texture = Texture.create(size=(width, height), colorfmt=image.colorfmt)
+    texture.blit_buffer(np.ascontiguousarray(image.pixels).tobytes(), colorfmt=image.colorfmt, bufferfmt="ubyte")
+    if image.flip_vertical:
+        texture.flip_vertical()
+    return texture
+
+def schedule_on_clock(callback: Callable[[], None]):
+    from kivy.clock import Clock
+
+    Clock.schedule_once(lambda dt: callback())
+
+class Texture_cache:
+    def __init__(
+        self,
+        max_size: tuple[int, int] = (512, 512),
+        capacity: int = 16,
+        workers: int = 2,
+        decode: Callable[[str, tuple[int, int]], Decoded_image] = decode_image,
+        make_texture: Callable[[Decoded_image], object] = create_texture,
+        dispatch: Callable[[Callable[[], None]], None] = schedule_on_clock,
+    ):
+        assert(capacity > 0)
+        self.max_size = max_size
+        self.capacity = capacity
+        self.workers = workers
+        self.decode = decode
+        self.make_texture = make_texture
+        # Runs worker results on the thread that owns the textures
+        self.dispatch = dispatch
+        self.textures = OrderedDict()
+        self.pending = {}
+        self.executor = None
+
+    def get(self, path: str):
+        if path in self.textures:
+            self.textures.move_to_end(path)
+            return self.textures[path]
+        future = self.pending.pop(path, None)
+        image = future.result() if future is not None else self.decode(path, self.max_size)
+        return self.__store(path, image)
+
+    def prefetch(self, paths: list[str]):
+        # Anything prefetched is about to be shown, so only the first capacity paths are worth decoding
+        for path in list(dict.fromkeys(paths))[:self.capacity]:
+            if path in self.textures:
+                self.textures.move_to_end(path)
+            elif path not in self.pending:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="image-cache")
+                future = self.executor.submit(self.decode, path, self.max_size)
+                self.pending[path] = future
+                future.add_done_callback(lambda future, path=path: self.dispatch(lambda: self.__finish(path, future)))
+
+    def clear(self):
+        self.textures.clear()
+        self.pending.clear()
+
+    def close(self):
+        self.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def __finish(self, path: str, future: Future):
+        if self.pending.get(path) is not future:
+            return
+        del self.pending[path]
+        if future.exception() is None:
+            self.__store(path, future.result())
+
+    def __store(self, path: str, image: Decoded_image):
+        self.textures[path] = self.make_texture(image)
+        self.textures.move_to_end(path)
+        while len(self.textures) > self.capacity:
+            self.textures.popitem(last=False)
+        return self.textures[path]
@@ -0,0 +1,101 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from AHP.ahp import AHP_complete_model
+from AHP.aggregation import Group_aggregator
+from AHP.persistence import load_comparison_csv_directory
+from AHP.profiling import Profiler, profiler
+from sugestator_to_model import SugestatorToModel
+
+ALTERNATIVES_FILE = "alternatives.txt"
+CRITERIA_FILE = "criteria.txt"
+ANSWERS_DIRECTORY = "answers"
+ANSWERS_FILES = ["answers.jsonl", "answers.csv"]
+
+METHODS = {name.lower().replace(" ", "-"): name for name in AHP_complete_model.CALCULATORS}
+
+
+def score_problem(problem_path: str, method: str, profile: bool = False) -> dict:
+    if profile:
+        profiler.reset()
+        with profiler.profile():
+            result = score_problem(problem_path, method)
+        result["profile"] = profiler.to_dict()
+        return result
+
+    result = {"problem": os.path.basename(os.path.normpath(problem_path)), "method": method}
+    try:
+        model = SugestatorToModel(os.path.join(problem_path, ALTERNATIVES_FILE), os.path.join(problem_path, CRITERIA_FILE)).model
+        answers_files = [os.path.join(problem_path, name) for name in ANSWERS_FILES if os.path.exists(os.path.join(problem_path, name))]
+        if answers_files:
+            complete_model = Group_aggregator(model).add_files(answers_files).aggregated_model()
+        else:
+            complete_model = load_comparison_csv_directory(model, os.path.join(problem_path, ANSWERS_DIRECTORY))
+        assert(isinstance(complete_model, AHP_complete_model))
+
+        result["ranking"] = complete_model.calculate_method(method)
+        result["koczkodaj"] = {criterion: index.value for criterion, index in complete_model.koczkoaj_all().items()}
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+    return result
+
+def find_problems(path: str) -> list[str]:
+    return sorted(os.path.join(path, name) for name in os.listdir(path) if os.path.exists(os.path.join(path, name, CRITERIA_FILE)))
+
+def collect_profiles(results, profile: Profiler):
+    for result in results:
+        if "profile" in result:
+            profile.add(result.pop("profile"))
+        yield result
+
+def write_results(results, output, output_format: str):
+    if output_format == "jsonl":
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+        return
+
+    writer = csv.writer(output)
+    writer.writerow(["problem", "method", "kind", "name", "value"])
+    for result in results:
+        if "error" in result:
+            writer.writerow([result["problem"], result["method"], "error", "", result["error"]])
+            continue
+        writer.writerows([result["problem"], result["method"], "score", name, value] for name, value in result["ranking"].items())
+        writer.writerows([result["problem"], result["method"], "koczkodaj", name, value] for name, value in result["koczkodaj"].items())
+
+def main(argv: list[str]|None = None) -> int:
+    parser = argparse.ArgumentParser(description="Score a directory of decision problems without the GUI.")
+    parser.add_argument("problems", help="directory with one sub-directory per problem (criteria.txt, alternatives.txt and answers)")
+    parser.add_argument("-m", "--method", choices=sorted(METHODS), default="gmm")
+    parser.add_argument("-o", "--output", help="output file, stdout when omitted")
+    parser.add_argument("-f", "--format", choices=["csv", "jsonl"], help="defaults to the output file extension, or jsonl")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunksize", type=int, default=16)
+    parser.add_argument("--profile", help="write per-stage timings of all workers, as JSON or as folded stacks for a .folded file")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ("csv" if args.output and args.output.endswith(".csv") else "jsonl")
+    problems = find_problems(args.problems)
+    methods = [METHODS[args.method]] * len(problems)
+    profile = Profiler()
+
+    with ProcessPoolExecutor(args.workers) as executor:
+        results = executor.map(score_problem, problems, methods, [args.profile is not None] * len(problems), chunksize=args.chunksize)
+        results = collect_profiles(results, profile)
+        if args.output:
+            with open(args.output, 'w', newline='') as output:
+                write_results(results, output, output_format)
+        else:
+            write_results(results, sys.stdout, output_format)
+
+    if args.profile:
+        profile.write(args.profile)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import argparse
+import functools
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from typing import Callable
+
+import numpy as np
+
+from AHP.ahp import AHP_complete_model, AHP_model, MAX_COMPARISON_VALUE, koczkodaj_batch, stack_comparison_matrices
+
+DEFAULT_SIZES = [3, 10, 100, 1000]
+DEFAULT_TOLERANCE = 0.25
+RATING_INTENSITIES = 5
+# Cubic cases are skipped above these sizes unless --max-size says otherwise
+SIZE_LIMITS = {"calculator/EVM": 2000, "calculator/Harker": 2000, "koczkodaj": 500, "koczkodaj/stack": 500, "builder/compare": 1000}
+
+def random_weights(rng: np.random.Generator, n: int) -> np.ndarray:
+    # Within one order of the scale, so every ratio of two weights is a valid judgment
+    return np.exp(rng.uniform(0, math.log(MAX_COMPARISON_VALUE), n))
+
+def consistent_matrix(rng: np.random.Generator, n: int) -> np.ndarray:
+    weights = random_weights(rng, n)
+    return np.clip(weights[:, np.newaxis] / weights[np.newaxis, :], 1 / MAX_COMPARISON_VALUE, MAX_COMPARISON_VALUE)
+
+def noisy_matrix(rng: np.random.Generator, n: int, sigma: float = 0.3) -> np.ndarray:
+    logs = np.log(consistent_matrix(rng, n))
+    noise = np.triu(rng.normal(0, sigma, (n, n)), 1)
+    return np.clip(np.exp(logs + noise - noise.T), 1 / MAX_COMPARISON_VALUE, MAX_COMPARISON_VALUE)
+
+def synthetic_hierarchy(criteria: int, sub_criteria: int = 0, depth: int = 2) -> tuple[list[str], dict[str, list[str]]]:
+    criteria_names = [f"C{i}" for i in range(criteria)]
+    sub_criteria_names, level = {}, criteria_names
+    for _ in range(depth - 1 if sub_criteria > 1 else 0):
+        sub_criteria_names.update({criterion: [f"{criterion}.{j}" for j in range(sub_criteria)] for criterion in level})
+        level = [child for criterion in level for child in sub_criteria_names[criterion]]
+    return criteria_names, sub_criteria_names
+
+def synthetic_model(rng: np.random.Generator, alternatives: int, criteria: int, sub_criteria: int = 0, sigma: float = 0.3, depth: int = 2) -> AHP_complete_model:
+    model = AHP_model(*synthetic_hierarchy(criteria, sub_criteria, depth), [f"A{i}" for i in range(alternatives)])
+
+    get_matrix = lambda n: noisy_matrix(rng, n, sigma) if sigma > 0 else consistent_matrix(rng, n)
+    return model.add_comparison_values({key: get_matrix(len(model.get_matrix_labels(key))) for key in model.matrix_keys()})
+
+def synthetic_rated_model(rng: np.random.Generator, alternatives: int, criteria: int, sub_criteria: int = 0, sigma: float = 0.3, depth: int = 2, intensities: int = RATING_INTENSITIES) -> AHP_complete_model:
+    criteria_names, sub_criteria_names = synthetic_hierarchy(criteria, sub_criteria, depth)
+    leaves = AHP_model(criteria_names, sub_criteria_names, []).leaf_criteria
+    model = AHP_model(criteria_names, sub_criteria_names, [f"A{i}" for i in range(alternatives)], {leaf: [f"I{k}" for k in range(intensities)] for leaf in leaves})
+
+    get_matrix = lambda n: noisy_matrix(rng, n, sigma) if sigma > 0 else consistent_matrix(rng, n)
+    model = model.add_comparison_values({key: get_matrix(len(model.get_matrix_labels(key))) for key in model.matrix_keys()})
+    for leaf in leaves:
+        model = model.add_alternatives_ratings(leaf, rng.integers(0, intensities, alternatives))
+    return model
+
+def measure(run: Callable[[object], object], setup: Callable[[], object], repeats: int) -> list[float]:
+    times = []
+    for _ in range(repeats):
+        argument = setup()
+        start = time.perf_counter()
+        run(argument)
+        times.append(time.perf_counter() - start)
+    return times
+
+def get_cases(rng: np.random.Generator, n: int, criteria: int, sub_criteria: int, sigma: float, depth: int) -> dict[str, tuple[Callable, Callable]]:
+    # Inputs are built on first use and outside the timed part, so skipped cases never allocate their matrices
+    get_matrix = functools.cache(lambda: noisy_matrix(rng, n, sigma) if sigma > 0 else consistent_matrix(rng, n))
+    get_complete = functools.cache(lambda: synthetic_model(rng, n, criteria, sub_criteria, sigma, depth))
+    get_stack = functools.cache(lambda: stack_comparison_matrices(list(get_complete().model.alternatives_comparison_matrixes.values()), get_complete().model.alternatives))
+    get_values = functools.cache(lambda: {key: get_complete().model.get_matrix(key).values for key in get_complete().model.matrix_keys()})
+    get_model = lambda: AHP_model(get_complete().model.criteria, get_complete().model.sub_criteria, get_complete().model.alternatives)
+
+    def compare_all(arguments):
+        builder, matrix = arguments
+        labels = builder.matrix.labels
+        for i, j in zip(*np.triu_indices(n, 1)):
+            builder = builder.compare(labels[i], labels[j], matrix[i, j])
+
+    cases = {f"calculator/{name}": (lambda matrix, calculator=calculator: calculator().calculate_values(matrix), get_matrix) for name, calculator in AHP_complete_model.CALCULATORS.items()}
+    cases["koczkodaj"] = (lambda complete: complete.koczkoaj_all(), get_complete)
+    cases["koczkodaj/stack"] = (koczkodaj_batch, get_stack)
+    cases["builder/compare"] = (compare_all, lambda: (get_model().build_alternatives_comparison(get_complete().model.leaf_criteria[0]), get_matrix()))
+    cases["builder/values"] = (lambda arguments: arguments[0].add_comparison_values(arguments[1]), lambda: (get_model(), get_values()))
+    cases["hierarchy/leaf_weights"] = (lambda arguments: arguments[0].leaf_weights(arguments[1]), lambda: (get_complete().model.hierarchy, get_complete().local_priorities(AHP_complete_model.GMM_calculator())))
+    cases["ratings/score"] = (lambda model: model.calculate_gmm(), lambda: synthetic_rated_model(rng, n, criteria, sub_criteria, sigma, depth))
+    for name in AHP_complete_model.METHODS:
+        cases[f"score/{name}"] = (lambda model, name=name: model.calculate_method(name), lambda: get_model().add_comparison_values(get_values()))
+    return cases
+
+def run_benchmarks(sizes: list[int], repeats: int = 5, criteria: int = 5, sub_criteria: int = 0, sigma: float = 0.3, seed: int = 0, select: list[str]|None = None, max_size: int|None = None, depth: int = 2) -> dict:
+    rng = np.random.default_rng(seed)
+    results = []
+    for n in sizes:
+        for name, (run, setup) in get_cases(rng, n, criteria, sub_criteria, sigma, depth).items():
+            if select and not any(name.startswith(prefix) for prefix in select):
+                continue
+            if n > (max_size or SIZE_LIMITS.get(name, math.inf)):
+                continue
+            times = measure(run, setup, repeats)
+            results.append({"name": name, "n": n, "best": min(times), "median": statistics.median(times), "repeats": repeats})
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "criteria": criteria,
+            "sub_criteria": sub_criteria,
+            "depth": depth,
+            "sigma": sigma,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+def compare_with_baseline(report: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[dict]:
+    baseline_results = {(result["name"], result["n"]): result for result in baseline["results"]}
+    comparisons = []
+    for result in report["results"]:
+        previous = baseline_results.get((result["name"], result["n"]))
+        if previous is None:
+            continue
+        ratio = result["best"] / previous["best"] if previous["best"] > 0 else math.inf
+        comparisons.append({"name": result["name"], "n": result["n"], "baseline": previous["best"], "best": result["best"], "ratio": ratio, "regression": ratio > 1 + tolerance})
+    return comparisons
+
+def main(argv: list[str]|None = None) -> int:
+    parser = argparse.ArgumentParser(description="Time the AHP calculators, Koczkodaj index, ingestion and scoring on synthetic problems.")
+    parser.add_argument("-n", "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="numbers of alternatives")
+    parser.add_argument("-r", "--repeats", type=int, default=5)
+    parser.add_argument("-c", "--criteria", type=int, default=5)
+    parser.add_argument("-s", "--sub-criteria", type=int, default=0, help="sub-criteria per criterion, 0 for a flat hierarchy")
+    parser.add_argument("-d", "--depth", type=int, default=2, help="levels of criteria when --sub-criteria is set")
+    parser.add_argument("--sigma", type=float, default=0.3, help="log-normal judgment noise, 0 for consistent matrices")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-k", "--select", nargs="+", help="only run benchmarks whose name starts with one of these")
+    parser.add_argument("--max-size", type=int, help="override the size limits of the cubic benchmarks")
+    parser.add_argument("-o", "--output", help="JSON report file, stdout when omitted")
+    parser.add_argument("-b", "--baseline", help="JSON report to compare against")
+    parser.add_argument("-t", "--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.repeats, args.criteria, args.sub_criteria, args.sigma, args.seed, args.select, args.max_size, args.depth)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        sys.stdout.write("\n")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, 'r') as f:
+        comparisons = compare_with_baseline(report, json.load(f), args.tolerance)
+    for comparison in comparisons:
+        mark = "REGRESSION" if comparison["regression"] else ""
+        sys.stderr.write(f"{comparison['name']:32} n={comparison['n']:<6} {comparison['baseline']:.6f}s -> {comparison['best']:.6f}s  x{comparison['ratio']:.2f} {mark}\n")
+    return 1 if any(comparison["regression"] for comparison in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,20 +2,36 @@ import os
 import itertools
 from typing import Callable
 
-from AHP.ahp import AHP_builder, AHP_complete_model
+import numpy as np
+
+from AHP.ahp import AHP_builder, AHP_complete_model, ALTERNATIVES_MATRIX, CRITERIA_MATRIX, SUB_CRITERIA_MATRIX
+from AHP.journal import Answer_journal
+from AHP.profiling import profiled
+from AHP.scheduler import Adaptive_pair_scheduler
 
 class SugestatorToModel:
-    def __init__(self, alternatives_path: os.path, criteria_path: os.path):
+    def __init__(self, alternatives_path: os.path, criteria_path: os.path, journal_path: str|None = None):
         self.load_alternatives(alternatives_path)
         self.load_criteria(criteria_path)
         self.mapping_function = lambda x: x
+        self.journal_path = journal_path
+        self.journal = None
         self.reset()
 
     def reset(self):
         self.build_model()
-        self.comparisions = {c:{a:{b:None for b in self.alternatives} for a in self.alternatives} for c in self.get_criteria_to_choose()}
-        self.criteria_comparisions = {a:{b:None for b in self.criteria} for a in self.criteria}
-        self.sub_criteria_comparisions = {crit:{a:{b:None for b in self.sub_criteria[crit]} for a in self.sub_criteria[crit]} for crit in self.sub_criteria.keys()}
+        keys = self.model.matrix_keys()
+        self.labels_index = {key:{label:i for i, label in enumerate(self.model.get_matrix_labels(key))} for key in keys}
+        if self.journal is None:
+            # An existing journal file is a session cut short, so its answers are picked up again
+            self.journal = Answer_journal(keys, [len(self.labels_index[key]) for key in keys], self.journal_path)
+        else:
+            self.journal.clear()
+        self.schedulers = {c:Adaptive_pair_scheduler(self.alternatives) for c in self.get_criteria_to_choose()}
+        for entry in self.journal.entries:
+            key = self.journal.matrix_keys[entry["matrix"]]
+            if key[0] == ALTERNATIVES_MATRIX:
+                self.schedulers[key[1]].answer(self.alternatives[entry["i"]], self.alternatives[entry["j"]], float(entry["value"]))
 
     def load_alternatives(self, path: os.path):
         self.alternatives = []
@@ -26,16 +42,21 @@ class SugestatorToModel:
     def load_criteria(self, path: os.path):
         self.criteria = []
         self.sub_criteria = {}
+        # Indentation depth decides the level, a line belongs to the closest less indented line above it
+        parents = []
         with open(path, 'r') as f:
             for line in f:
                 if not line.strip():
                     continue
-                if line.startswith(' '):
-                    if self.criteria[-1] not in self.sub_criteria:
-                        self.sub_criteria[self.criteria[-1]] = []
-                    self.sub_criteria[self.criteria[-1]].append(line.strip())
+                line = line.rstrip().expandtabs(4)
+                indent = len(line) - len(line.lstrip())
+                while parents and parents[-1][0] >= indent:
+                    parents.pop()
+                if parents:
+                    self.sub_criteria.setdefault(parents[-1][1], []).append(line.strip())
                 else:
                     self.criteria.append(line.strip())
+                parents.append((indent, line.strip()))
 
     def build_model(self):
         self.model = AHP_builder()
@@ -51,48 +72,40 @@ class SugestatorToModel:
     def set_mapping_function(self, mapping_function: Callable[[int], int]):
         self.mapping_function = mapping_function
 
+    @profiled("load_comparisions_value_into_model")
     def load_comparisions_value_into_model(self) -> AHP_complete_model:
-        combinations = lambda x: list(itertools.combinations(x, 2))
-
-        def add_comparision_to_model(first, second, value):
-            self.model = self.model.compare(first, second, value) if value >= 0 else self.model.compare(second, first, -value)
+        self.model = self.model.add_comparison_values(self.get_comparision_matrices())
+        return self.model
 
-        for criterion in self.get_criteria_to_choose():
-            self.model = self.model.build_alternatives_comparison(criterion)
-            for first_alt, second_alt in combinations(self.alternatives):
-                add_comparision_to_model(first_alt, second_alt, self.comparisions[criterion][first_alt][second_alt])
+    @profiled("get_comparision_matrices")
+    def get_comparision_matrices(self) -> dict[tuple[str, str], np.ndarray]:
+        return self.journal.replay()
 
-        self.model = self.model.build_criteria_comparison()
-        for first_crit, second_crit in combinations(self.criteria):
-            add_comparision_to_model(first_crit, second_crit, self.criteria_comparisions[first_crit][second_crit])
+    def record_comparision(self, matrix_key: tuple[str, str], first: str, second: str, value: int) -> float:
+        # The answer is how much second beats first, the journal keeps the ratio of first to second
+        signed_value = self.mapping_function(-value)
+        ratio = signed_value if signed_value > 0 else -1 / signed_value
+        labels_index = self.labels_index[matrix_key]
+        self.journal.append(matrix_key, labels_index[first], labels_index[second], ratio)
+        return ratio
 
-        for criterion in self.sub_criteria.keys():
-            self.model = self.model.build_sub_criteria_comparison(criterion)
-            for first_crit, second_crit in combinations(self.sub_criteria[criterion]):
-                add_comparision_to_model(first_crit, second_crit, self.sub_criteria_comparisions[criterion][first_crit][second_crit])
+    def sync(self):
+        self.journal.sync()
 
-        return self.model
+    def close(self):
+        self.journal.close()
 
     def get_criteria_to_choose(self) -> list[str]:
-        result = []
+        return self.get_leaf_criteria(self.criteria)
 
-        for criterion in self.criteria:
-            if criterion not in self.sub_criteria:
-                result.append(criterion)
-            else:
-                for sub_criterion in self.sub_criteria[criterion]:
-                    result.append(sub_criterion)
-        return result
+    def get_leaf_criteria(self, criteria: list[str]) -> list[str]:
+        return [leaf for criterion in criteria for leaf in (self.get_leaf_criteria(self.sub_criteria[criterion]) if criterion in self.sub_criteria else [criterion])]
 
     def get_criteria_and_subcriteria_combinations(self) -> list[(str, str)]:
         result = list(itertools.combinations(self.criteria, 2))
 
-        for criterion in self.criteria:
-            if criterion in self.sub_criteria:
-                tmp = []
-                for sub_criterion in self.sub_criteria[criterion]:
-                    tmp.append(sub_criterion)
-                result += list(itertools.combinations(tmp, 2))
+        for sub_criteria in self.sub_criteria.values():
+            result += list(itertools.combinations(sub_criteria, 2))
         return result
 
     def has_sub_criteria(self, criterion: str) -> bool:
@@ -101,18 +114,21 @@ class SugestatorToModel:
     def get_sub_critera(self, criterion: str) -> list[str]:
         return self.sub_criteria[criterion]
 
+    def next_alternatives_pair(self, criterion: str) -> tuple[str, str]|None:
+        return self.schedulers[criterion].next_pair()
+
+    def upcoming_alternatives_pairs(self, criterion: str, count: int) -> list[tuple[str, str]]:
+        return self.schedulers[criterion].upcoming_pairs(count)
+
     def add_partial_comparision(self, first_alter: str, second_alter: str, criterion: str, value: int):
-        self.comparisions[criterion][second_alter][first_alter] = self.mapping_function(value)
-        self.comparisions[criterion][first_alter][second_alter] = self.mapping_function(-value)
+        ratio = self.record_comparision((ALTERNATIVES_MATRIX, criterion), first_alter, second_alter, value)
+        self.schedulers[criterion].answer(first_alter, second_alter, ratio)
 
     def add_partial_cryteria_comparision(self, first_cryterion: str, second_cryterion: str, value: int):
         if self.is_main_criterion(first_cryterion) and self.is_main_criterion(second_cryterion):
-            self.criteria_comparisions[second_cryterion][first_cryterion] = self.mapping_function(value)
-            self.criteria_comparisions[first_cryterion][second_cryterion] = self.mapping_function(-value)
+            self.record_comparision((CRITERIA_MATRIX, ""), first_cryterion, second_cryterion, value)
         else:
-            main_cryterion = self.get_main_criterion(first_cryterion)
-            self.sub_criteria_comparisions[main_cryterion][second_cryterion][first_cryterion] = self.mapping_function(value)
-            self.sub_criteria_comparisions[main_cryterion][first_cryterion][second_cryterion] = self.mapping_function(-value)
+            self.add_partial_sub_cryteria_comparision(first_cryterion, second_cryterion, self.get_main_criterion(first_cryterion), value)
 
     def is_main_criterion(self, criterion: str) -> bool:
         return criterion in self.criteria
@@ -123,8 +139,7 @@ class SugestatorToModel:
                 return main_criterion
 
     def add_partial_sub_cryteria_comparision(self, first_cryterion: str, second_cryterion: str, main_cryterion: str, value: int):
-        self.sub_criteria_comparisions[main_cryterion][second_cryterion][first_cryterion] = self.mapping_function(value)
-        self.sub_criteria_comparisions[main_cryterion][first_cryterion][second_cryterion] = self.mapping_function(-value)
+        self.record_comparision((SUB_CRITERIA_MATRIX, main_cryterion), first_cryterion, second_cryterion, value)
 
 if __name__ == '__main__':
     sugestator = SugestatorToModel('Data/alternatives.txt', 'Data/criteria.txt')
@@ -0,0 +1,23 @@
+from AHP.ahp import AHP_complete_model, AHP_model
+
+
+def build_two_criteria_model(complete: bool = True) -> AHP_model|AHP_complete_model:
+    model = (
+        AHP_model(["X", "Y"], {"Y": ["Y1", "Y2"]}, ["A", "B", "C"])
+        .build_alternatives_comparison("X").compare("A", "B", 5).compare("A", "C", 7).compare("B", "C", 2)
+        .build_alternatives_comparison("Y1").compare("B", "A", 2).compare("B", "C", 3).compare("C", "A", 2)
+        .build_alternatives_comparison("Y2").compare("A", "B", 1).compare("C", "B", 2).compare("A", "C", 1)
+        .build_criteria_comparison().compare("X", "Y", 2)
+    )
+    return model.build_sub_criteria_comparison("Y").compare("Y1", "Y2", 3) if complete else model
+
+def build_three_criteria_model() -> AHP_complete_model:
+    return (
+        AHP_model(["X", "Y", "Z"], {"Z": ["Z1", "Z2"]}, ["A", "B", "C"])
+        .build_alternatives_comparison("X").compare("A", "B", 5).compare("A", "C", 7).compare("B", "C", 2)
+        .build_alternatives_comparison("Y").compare("B", "A", 4).compare("B", "C", 3).compare("C", "A", 2)
+        .build_alternatives_comparison("Z1").compare("C", "A", 6).compare("C", "B", 5).compare("A", "B", 1)
+        .build_alternatives_comparison("Z2").compare("A", "B", 2).compare("C", "B", 2).compare("A", "C", 1)
+        .build_criteria_comparison().compare("X", "Y", 2).compare("X", "Z", 3).compare("Y", "Z", 2)
+        .build_sub_criteria_comparison("Z").compare("Z1", "Z2", 3)
+    )
@@ -0,0 +1,66 @@
+import csv
+import json
+import os
+import tempfile
+
+import numpy as np
+import unittest
+
+from AHP.ahp import AHP_complete_model, AHP_model, ALTERNATIVES_MATRIX, CRITERIA_MATRIX
+from AHP.aggregation import ANSWER_FIELDS, Answer, Group_aggregator
+
+
+class TestAggregation(unittest.TestCase):
+
+    RESPONDENTS = [
+        {"respondent": "1", "answers": [
+            {"matrix": CRITERIA_MATRIX, "first": "X", "second": "Y", "value": 3},
+            {"matrix": ALTERNATIVES_MATRIX, "criterion": "X", "first": "A", "second": "B", "value": 4},
+            {"matrix": ALTERNATIVES_MATRIX, "criterion": "Y", "first": "A", "second": "B", "value": 1/2},
+        ]},
+        {"respondent": "2", "answers": [
+            {"matrix": CRITERIA_MATRIX, "first": "Y", "second": "X", "value": 3},
+            {"matrix": ALTERNATIVES_MATRIX, "criterion": "X", "first": "A", "second": "B", "value": 9},
+            {"matrix": ALTERNATIVES_MATRIX, "criterion": "Y", "first": "B", "second": "A", "value": 8},
+        ]},
+    ]
+
+    def test_aij(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jsonl_path = os.path.join(directory, "answers.jsonl")
+            with open(jsonl_path, 'w') as f:
+                f.writelines(json.dumps(record) + "\n" for record in self.RESPONDENTS)
+            csv_path = os.path.join(directory, "answers.csv")
+            with open(csv_path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, ANSWER_FIELDS)
+                writer.writeheader()
+                for record in self.RESPONDENTS:
+                    writer.writerows({"respondent": record["respondent"], "criterion": "", **answer} for answer in record["answers"])
+
+            for path in [jsonl_path, csv_path]:
+                aggregator = Group_aggregator(AHP_model(["X", "Y"], {}, ["A", "B"])).add_files([path])
+                complete = aggregator.aggregated_model()
+
+                self.assertIsInstance(complete, AHP_complete_model)
+                self.assertEqual(aggregator.respondents, 2)
+                self.assertAlmostEqual(complete.model.get_matrix((CRITERIA_MATRIX, ""))["X", "Y"], 1)
+                self.assertAlmostEqual(complete.model.get_matrix((ALTERNATIVES_MATRIX, "X"))["A", "B"], 6)
+                self.assertAlmostEqual(complete.model.get_matrix((ALTERNATIVES_MATRIX, "Y"))["B", "A"], 4)
+
+    def test_aip(self):
+        model = AHP_model(["X", "Y"], {}, ["A", "B"])
+        aggregator = Group_aggregator(model)
+        individual = []
+        for record in self.RESPONDENTS:
+            answers = [Answer(answer["matrix"], answer.get("criterion", ""), answer["first"], answer["second"], answer["value"]) for answer in record["answers"]]
+            aggregator.add_respondent(answers)
+            individual.append(Group_aggregator(model).add_respondent(answers).aggregated_model().calculate_gmm())
+
+        arithmetic = aggregator.aggregated_priorities(geometric=False)
+        self.assertAlmostEqual(arithmetic["A"], (individual[0]["A"] + individual[1]["A"]) / 2)
+        geometric = aggregator.aggregated_priorities()
+        self.assertAlmostEqual(geometric["A"] / geometric["B"], np.sqrt(individual[0]["A"] * individual[1]["A"] / (individual[0]["B"] * individual[1]["B"])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,480 @@
+import numpy as np
+import unittest
+
+from AHP.ahp import (
+    AHP_builder, AHP_complete_model, AHP_model, Comparison_matrix, koczkodaj_batch, stack_comparison_matrices, top_k_indices,
+    ALTERNATIVES_MATRIX, CRITERIA_MATRIX, INTENSITIES_MATRIX, SUB_CRITERIA_MATRIX,
+)
+from AHP.consistency import Random_index_table
+
+
+class TestAHP(unittest.TestCase):
+
+    def test_basic_example(self):
+        ahp_result = (
+            AHP_builder()
+            .add_alternative("A")
+            .add_alternative("B")
+            .add_criterion("X")
+            .add_criterion("Y")
+            .build()
+            .build_alternatives_comparison("X")
+            .compare("A", "B", 9)
+            .build_alternatives_comparison("Y")
+            .compare("A", "B", 1)
+            .build_criteria_comparison()
+            .compare("X", "Y", 9)
+            .calculate_gmm()
+        )
+
+        self.assertGreater(ahp_result["A"], ahp_result["B"])
+
+    def test_wikipedia_leader(self):
+        # https://en.wikipedia.org/wiki/Analytic_hierarchy_process_–_leader_example
+        ahp_result = (
+            AHP_builder()
+            .add_alternative("Tom")
+            .add_alternative("Dick")
+            .add_alternative("Harry")
+            .add_criterion("Experience")
+            .add_criterion("Education")
+            .add_criterion("Charisma")
+            .add_criterion("Age")
+            .build()
+            .build_alternatives_comparison("Experience")
+            .compare("Dick", "Tom", 4)
+            .compare("Tom", "Harry", 4)
+            .compare("Dick", "Harry", 9)
+            .build_alternatives_comparison("Education")
+            .compare("Tom", "Dick", 3)
+            .compare("Harry", "Tom", 5)
+            .compare("Harry", "Dick", 7)
+            .build_alternatives_comparison("Charisma")
+            .compare("Tom", "Dick", 5)
+            .compare("Tom", "Harry", 9)
+            .compare("Dick", "Harry", 4)
+            .build_alternatives_comparison("Age")
+            .compare("Dick", "Tom", 3)
+            .compare("Tom", "Harry", 5)
+            .compare("Dick", "Harry", 9)
+            .build_criteria_comparison()
+            .compare("Experience", "Education", 4)
+            .compare("Experience", "Charisma", 3)
+            .compare("Experience", "Age", 7)
+            .compare("Education", "Age", 3)
+            .compare("Charisma", "Education", 3)
+            .compare("Charisma", "Age", 5)
+            .calculate_gmm()
+        )
+
+        ranking = [k for k, _ in sorted(ahp_result.items(), key=lambda item: item[1], reverse=True)]
+        self.assertEqual(ranking, ["Dick", "Tom", "Harry"])
+
+    def test_sub_criteria(self):
+        ahp_result = (
+            AHP_builder()
+            .add_alternative("A")
+            .add_alternative("B")
+            .add_criterion("X")
+            .add_criterion("Y")
+            .add_sub_criterion("X", "X1")
+            .add_sub_criterion("X", "X2")
+            .build()
+            .build_alternatives_comparison("Y")
+            .compare("A", "B", 1)
+            .build_alternatives_comparison("X1")
+            .compare("A", "B", 2)
+            .build_alternatives_comparison("X2")
+            .compare("B", "A", 3)
+            .build_criteria_comparison()
+            .compare("X", "Y", 1)
+            .build_sub_criteria_comparison("X")
+            .compare("X1", "X2", 2)
+            .calculate_gmm()
+        )
+
+        self.assertGreater(ahp_result["A"], ahp_result["B"])
+
+    def test_leaf_weights(self):
+        model = AHP_model(["X", "Y", "Z"], {"X": ["X1", "X2"], "Z": ["Z1", "Z2"]}, ["A", "B"])
+        self.assertEqual(model.leaf_criteria, ["X1", "X2", "Y", "Z1", "Z2"])
+        (
+            model.build_criteria_comparison().compare("X", "Y", 2).compare("X", "Z", 4).compare("Y", "Z", 2)
+            .build_sub_criteria_comparison("X").compare("X2", "X1", 3)
+            .build_sub_criteria_comparison("Z").compare("Z1", "Z2", 1)
+        )
+        complete = AHP_complete_model(model)
+        calculator = AHP_complete_model.GMM_calculator()
+        weights = complete.leaf_weights(calculator)
+
+        np.testing.assert_allclose(weights, np.array([1/4, 3/4, 1, 1/2, 1/2]) * np.array([4, 4, 2, 1, 1]) / 7)
+        self.assertIs(complete.leaf_weights(calculator), weights)
+
+    def test_deep_hierarchy(self):
+        model = (
+            AHP_builder()
+            .add_alternative("A").add_alternative("B")
+            .add_criterion("Price").add_criterion("Comfort")
+            .add_sub_criterion("Comfort", "Size").add_sub_criterion("Comfort", "Heat")
+            .add_sub_criterion("Heat", "CPU").add_sub_criterion("Heat", "GPU")
+            .build()
+        )
+        self.assertEqual(model.leaf_criteria, ["Price", "Size", "CPU", "GPU"])
+        self.assertEqual(list(model.leaf_root_index), [0, 1, 1, 1])
+        self.assertEqual(model.hierarchy.depth, 3)
+        with self.assertRaises(AssertionError):
+            model.build_alternatives_comparison("Heat")
+
+        complete = (
+            model.build_criteria_comparison().compare("Comfort", "Price", 3)
+            .build_sub_criteria_comparison("Comfort").compare("Heat", "Size", 4)
+            .build_sub_criteria_comparison("Heat").compare("CPU", "GPU", 1)
+            .build_alternatives_comparison("Price").compare("A", "B", 9)
+            .build_alternatives_comparison("Size").compare("B", "A", 9)
+            .build_alternatives_comparison("CPU").compare("B", "A", 9)
+            .build_alternatives_comparison("GPU").compare("B", "A", 9)
+        )
+        calculator = AHP_complete_model.GMM_calculator()
+        np.testing.assert_allclose(complete.leaf_weights(calculator), [1/4, 3/4 * 1/5, 3/4 * 4/5 * 1/2, 3/4 * 4/5 * 1/2])
+        np.testing.assert_allclose(complete.local_leaf_priorities(calculator), [1, 1/5, 4/5 * 1/2, 4/5 * 1/2])
+
+        result = complete.calculate_gmm()
+        self.assertAlmostEqual(result["A"], 1/4 * 9/10 + 3/4 * 1/10)
+        self.assertEqual(complete.model.matrix_keys()[:3], [(CRITERIA_MATRIX, ""), (SUB_CRITERIA_MATRIX, "Comfort"), (SUB_CRITERIA_MATRIX, "Heat")])
+
+        complete.model.build_sub_criteria_comparison("Heat").compare("CPU", "GPU", 3)
+        np.testing.assert_allclose(complete.leaf_weights(calculator)[2:], 3/4 * 4/5 * np.array([3/4, 1/4]))
+
+    def test_calculate_all_cache(self):
+        complete = (
+            AHP_model(["X", "Y"], {}, ["A", "B", "C"])
+            .build_alternatives_comparison("X").compare("A", "B", 3).compare("A", "C", 5).compare("B", "C", 2)
+            .build_alternatives_comparison("Y").compare("B", "A", 2).compare("C", "A", 4).compare("C", "B", 2)
+            .build_criteria_comparison().compare("X", "Y", 3)
+        )
+        results = complete.calculate_all()
+        self.assertEqual(list(results), ["GMM", "EVM", "Simple Column", "Simple Scaled Column"])
+        self.assertEqual(results["GMM"], complete.calculate_gmm())
+        for name, result in results.items():
+            self.assertEqual(list(result), ["A", "B", "C"], name)
+
+        x_priorities = complete.priority_cache["GMM"][(ALTERNATIVES_MATRIX, "X")]
+        updated = complete.model.build_alternatives_comparison("Y").compare("A", "B", 9).compare("A", "C", 9).compare("B", "C", 9)
+        self.assertIs(updated, complete)
+        self.assertNotIn((ALTERNATIVES_MATRIX, "Y"), complete.priority_cache["GMM"])
+        self.assertIs(complete.priority_cache["GMM"][(ALTERNATIVES_MATRIX, "X")], x_priorities)
+        self.assertEqual(complete.ranking_cache, {})
+        self.assertGreater(complete.calculate_gmm()["A"], results["GMM"]["A"])
+
+    def test_update_comparison(self):
+        build = lambda a_b: (
+            AHP_model(["X", "Y"], {"Y": ["Y1", "Y2"]}, ["A", "B", "C", "D"])
+            .build_alternatives_comparison("X").compare("A", "B", 3).compare("A", "C", 5).compare("B", "C", 2).compare("D", "A", 2).compare("D", "B", 4).compare("C", "D", 3)
+            .build_alternatives_comparison("Y1").compare("B", "A", a_b).compare("C", "A", 4).compare("C", "B", 2).compare("A", "D", 7).compare("B", "D", 1).compare("D", "C", 6)
+            .build_alternatives_comparison("Y2").compare("A", "B", 1).compare("A", "C", 2).compare("B", "C", 3).compare("A", "D", 4).compare("B", "D", 5).compare("C", "D", 6)
+            .build_criteria_comparison().compare("X", "Y", 3)
+            .build_sub_criteria_comparison("Y").compare("Y1", "Y2", 5)
+        )
+        complete = build(2)
+        complete.calculate_all()
+        complete.calculate_power_evm()
+        scores = complete.scores("GMM")
+        scores_before = scores.copy()
+        complete.update_comparison((ALTERNATIVES_MATRIX, "Y1"), "B", "A", 8).update_comparison((ALTERNATIVES_MATRIX, "Y1"), "B", "A", 7)
+        complete.update_comparison((SUB_CRITERIA_MATRIX, "Y"), "Y2", "Y1", 2).update_comparison((SUB_CRITERIA_MATRIX, "Y"), "Y1", "Y2", 5)
+
+        expected = build(7)
+        for name, result in complete.calculate_all().items():
+            for alternative, value in expected.calculate_all()[name].items():
+                self.assertAlmostEqual(result[alternative], value, 10)
+        for alternative, value in expected.calculate_power_evm().items():
+            self.assertAlmostEqual(complete.calculate_power_evm()[alternative], value, 10)
+        np.testing.assert_array_equal(scores, scores_before)
+
+    def test_update_dict_matrix(self):
+        complete = (
+            AHP_model(["X", "Y"], {}, ["a", "b", "c"])
+            .add_alternatives_comparison_matrix("X", {"a": {"a": 1, "b": 2, "c": 3}, "b": {"a": 1/2, "b": 1, "c": 4}, "c": {"a": 1/3, "b": 1/4, "c": 1}})
+            .build_alternatives_comparison("Y").compare("a", "b", 2).compare("c", "a", 4).compare("b", "c", 3)
+            .add_criterion_comparison_matrix({"X": {"X": 1, "Y": 3}, "Y": {"X": 1/3, "Y": 1}})
+        )
+        scores = complete.calculate_gmm()
+        complete.update_comparison((ALTERNATIVES_MATRIX, "X"), "a", "b", 9).update_comparison((CRITERIA_MATRIX, ""), "Y", "X", 2)
+        self.assertEqual(complete.model.get_matrix((ALTERNATIVES_MATRIX, "X"))["a", "b"], 9)
+        self.assertEqual(complete.model.get_matrix((CRITERIA_MATRIX, ""))["X", "Y"], 1/2)
+        self.assertNotEqual(complete.calculate_gmm(), scores)
+
+    def test_koczkodaj(self):
+        alts = ["a", "b", "c", "d", "e"]
+        cryt = ["1"]
+        mat_list = [
+            [1, 69/74, 10/31, 7/22, 19/7],
+            [74/69, 1, 27/43, 2/3, 34/13],
+            [31/10, 43/27, 1, 47/38, 73/7],
+            [22/7, 3/2, 38/47, 1, 7],
+            [7/19, 13/34, 7/73, 1/7, 1],
+        ]
+        mat_dict = {
+            alts[a]:{alts[b]:mat_list[a][b] for b in range(len(alts))} for a in range(len(alts))
+        }
+        model = AHP_model(cryt, {}, alts)
+        model.alternatives_comparison_matrixes = {"1":mat_dict}
+        complete = AHP_complete_model(model)
+
+        self.assertAlmostEqual(complete.koczkoaj("1"), 0.60059, 5)
+
+    def test_koczkodaj_all(self):
+        alts = ["a", "b", "c", "d", "e"]
+        rng = np.random.default_rng(0)
+        matrixes = {}
+        for criterion in ["1", "2", "3"]:
+            logs = np.triu(rng.normal(size=(5, 5)), 1)
+            matrixes[criterion] = Comparison_matrix(alts, np.exp(logs - logs.T))
+        model = AHP_model(list(matrixes), {}, alts)
+        model.alternatives_comparison_matrixes = matrixes
+        complete = AHP_complete_model(model)
+
+        chunked = koczkodaj_batch(stack_comparison_matrices(list(matrixes.values()), alts), chunk_elements=1)
+        for criterion, (value, triad) in complete.koczkoaj_all().items():
+            c = matrixes[criterion].values
+            expected = {
+                (i, j, k): min(abs(1-((c[i, k]*c[k, j]/c[i, j]))), abs(1-((c[i, j]*c[i, k]/c[k, j]))))
+                for i in range(5) for j in range(i+1, 5) for k in range(j+1, 5)
+            }
+            worst = max(expected, key=expected.get)
+            self.assertAlmostEqual(value, expected[worst])
+            self.assertEqual(triad, tuple(alts[index] for index in worst))
+        np.testing.assert_allclose(chunked[0], [result.value for result in complete.koczkoaj_all().values()])
+        stack = stack_comparison_matrices(list(matrixes.values()), alts)
+        for chunk_elements in [1, 50, 60]:
+            values, triads = koczkodaj_batch(stack, chunk_elements)
+            np.testing.assert_allclose(values, chunked[0])
+            np.testing.assert_array_equal(triads, chunked[1])
+
+    def test_evm(self):
+        matrix = {
+            "a": {"a": 1, "b": 2, "c": 3},
+            "b": {"a": 1/2, "b": 1, "c": 4},
+            "c": {"a": 1/3, "b": 1/4, "c": 1},
+        }
+        result = AHP_complete_model.EVM_calculator().calculate(matrix)
+        self.assertAlmostEqual(result["a"], 0.517, 2)
+        self.assertAlmostEqual(result["b"], 0.358, 2)
+        self.assertAlmostEqual(result["c"], 0.124, 2)
+
+    def test_power_evm(self):
+        values = np.array([[1, 2, 3], [1/2, 1, 4], [1/3, 1/4, 1]])
+        eigenvalues, _ = np.linalg.eig(values)
+        calculator = AHP_complete_model.PowerEVM_calculator(tolerance=1e-12)
+
+        np.testing.assert_allclose(calculator.calculate_values(values), AHP_complete_model.EVM_calculator().calculate_values(values))
+        self.assertAlmostEqual(calculator.lambda_max[0], np.max(eigenvalues.real))
+
+        priorities, lambda_max = calculator.solve(values, warm_start=calculator.calculate_values(values))
+        self.assertEqual(calculator.iterations, 1)
+        self.assertEqual(priorities.dtype, np.float64)
+        self.assertAlmostEqual(lambda_max, np.max(eigenvalues.real))
+
+    def test_power_evm_parameters(self):
+        build = lambda: (
+            AHP_model(["X", "Y"], {}, ["A", "B", "C", "D"])
+            .build_alternatives_comparison("X").compare("A", "B", 3).compare("A", "C", 5).compare("B", "C", 4).compare("D", "A", 2).compare("B", "D", 6).compare("C", "D", 3)
+            .build_alternatives_comparison("Y").compare("B", "A", 2).compare("C", "A", 4).compare("B", "C", 3).compare("A", "D", 7).compare("D", "B", 5).compare("D", "C", 2)
+            .build_criteria_comparison().compare("X", "Y", 3)
+        )
+        complete = build()
+        exact = complete.calculate_power_evm()
+        rough = complete.calculate_power_evm(tolerance=0.5, max_iterations=1)
+        self.assertEqual(rough, build().calculate_power_evm(tolerance=0.5, max_iterations=1))
+        self.assertNotEqual(rough, exact)
+        self.assertEqual(complete.calculate_power_evm(), exact)
+
+        # Updates re-solve with the calculator that filled the cache, not a default one
+        rough_calculator = AHP_complete_model.PowerEVM_calculator(tolerance=0.5, max_iterations=1)
+        complete.update_comparison((ALTERNATIVES_MATRIX, "X"), "B", "C", 2)
+        self.assertEqual(complete.get_calculator(rough_calculator.cache_key).iterations, 1)
+        expected = build().update_comparison((ALTERNATIVES_MATRIX, "X"), "B", "C", 2)
+        for alternative, value in expected.calculate_power_evm().items():
+            self.assertAlmostEqual(complete.calculate_power_evm()[alternative], value, 10)
+        self.assertNotEqual(complete.calculate_power_evm(tolerance=0.5, max_iterations=1), complete.calculate_power_evm())
+
+    def test_power_evm_mixed_stack(self):
+        full = np.array([[1, 2, 3], [1/2, 1, 4], [1/3, 1/4, 1]])
+        incomplete = np.array([[1, 2, -1], [1/2, 1, 4], [-1, 1/4, 1]])
+        other = np.array([[1, 1/5, 7], [5, 1, 2], [1/7, 1/2, 1]])
+        calculator = AHP_complete_model.PowerEVM_calculator()
+        priorities = calculator.calculate_stack(np.stack([full, incomplete, other]))
+
+        self.assertEqual(calculator.lambda_max.shape, (3,))
+        for index, values in enumerate([full, incomplete, other]):
+            single = AHP_complete_model.PowerEVM_calculator()
+            np.testing.assert_allclose(priorities[index], single.calculate_stack(values[np.newaxis])[0])
+            self.assertAlmostEqual(calculator.lambda_max[index], single.lambda_max[0])
+
+    def test_comparison_matrix(self):
+        model = AHP_model(["X"], {}, ["a", "b", "c"])
+        builder = model.build_alternatives_comparison("X").compare("a", "b", 2).compare("c", "a", 4)
+        self.assertIs(builder.compare("b", "c", 3), model)
+
+        matrix = model.alternatives_comparison_matrixes["X"]
+        self.assertIsInstance(matrix, Comparison_matrix)
+        self.assertEqual(matrix.values.dtype, np.float64)
+        self.assertEqual(matrix["b", "a"], 1/2)
+        self.assertEqual(matrix["a", "c"], 1/4)
+        self.assertEqual(Comparison_matrix.from_dict(matrix.to_dict()).values.tolist(), matrix.values.tolist())
+        self.assertEqual(matrix.values_in_order(["c", "b", "a"])[0].tolist(), [1, 1/3, 4])
+
+    def test_incomplete_matrices(self):
+        complete_values = np.array([[1, 2, 6, 4], [1/2, 1, 3, 2], [1/6, 1/3, 1, 2/3], [1/4, 1/2, 3/2, 1]])
+        np.testing.assert_allclose(AHP_complete_model.LLSM_calculator().calculate_values(complete_values), AHP_complete_model.GMM_calculator().calculate_values(complete_values))
+        np.testing.assert_allclose(AHP_complete_model.Harker_calculator().calculate_values(complete_values), AHP_complete_model.EVM_calculator().calculate_values(complete_values))
+
+        model = AHP_model(["X"], {}, ["a", "b", "c", "d"])
+        builder = model.build_alternatives_comparison("X").compare("a", "b", 2).compare("b", "c", 3)
+        self.assertRaises(AssertionError, builder.finish)
+        complete = builder.compare("d", "c", 1.5).finish().build_criteria_comparison().finish()
+
+        expected = complete_values[:, 0] / complete_values[:, 0].sum()
+        results = complete.calculate_all()
+        for name in ["GMM", "EVM", "Simple Column"]:
+            priorities = np.array(list(results[name].values()))
+            np.testing.assert_allclose(priorities / priorities.sum(), expected)
+        self.assertEqual(complete.koczkoaj("X"), 0)
+
+    def test_add_comparison_values(self):
+        expected = (
+            AHP_model(["X", "Y"], {}, ["A", "B", "C"])
+            .build_alternatives_comparison("X").compare("A", "B", 3).compare("A", "C", 5).compare("B", "C", 2)
+            .build_alternatives_comparison("Y").compare("B", "A", 2).compare("C", "A", 4).compare("C", "B", 2)
+            .build_criteria_comparison().compare("X", "Y", 3)
+        ).calculate_all()
+
+        complete = AHP_model(["X", "Y"], {}, ["A", "B", "C"]).add_comparison_values({
+            (CRITERIA_MATRIX, ""): [3],
+            (ALTERNATIVES_MATRIX, "X"): [3, 5, 2],
+            (ALTERNATIVES_MATRIX, "Y"): [[1, 1/2, 1/4], [2, 1, 1/2], [4, 2, 1]],
+        })
+        self.assertEqual(complete.calculate_all(), expected)
+
+        model = AHP_model(["X", "Y"], {}, ["A", "B", "C"])
+        self.assertRaises(AssertionError, model.add_comparison_values, {(ALTERNATIVES_MATRIX, "X"): [3, 10, 2]})
+        self.assertRaises(AssertionError, model.add_comparison_values, {(ALTERNATIVES_MATRIX, "X"): [[1, 2, 3], [1/2, 1, 4], [1/3, 1/3, 1]]})
+        self.assertRaises(AssertionError, model.add_comparison_values, {(ALTERNATIVES_MATRIX, "X"): [-1, -1, 2]})
+        self.assertIs(model.add_comparison_values({(ALTERNATIVES_MATRIX, "X"): [-1, 4, 2]}), model)
+        self.assertEqual(model.remaining_matrices, 2)
+
+    def test_add_comparison_values_keys(self):
+        model = AHP_model(["X", "Y"], {"Y": ["Y1", "Y2"]}, ["A", "B"])
+        values = {(CRITERIA_MATRIX, ""): [2], (SUB_CRITERIA_MATRIX, "Y"): [3], (ALTERNATIVES_MATRIX, "X"): [4], (ALTERNATIVES_MATRIX, "Y1"): [5]}
+        self.assertRaises(AssertionError, model.add_comparison_values, {**values, (ALTERNATIVES_MATRIX, "Y"): [6]})
+        self.assertRaises(AssertionError, model.add_comparison_values, {**values, (ALTERNATIVES_MATRIX, "Y3"): [6]})
+        self.assertRaises(AssertionError, model.add_comparison_matrix, (ALTERNATIVES_MATRIX, "Y"), Comparison_matrix(["A", "B"], [[1, 6], [1/6, 1]]))
+        self.assertEqual(model.remaining_matrices, 5)
+        self.assertIsInstance(model.add_comparison_values({**values, (ALTERNATIVES_MATRIX, "Y2"): [6]}), AHP_complete_model)
+
+    def test_completion_tracking(self):
+        model = AHP_model(["X", "Y"], {}, ["a", "b", "c"])
+        builder = model.build_alternatives_comparison("X").compare("a", "b", 2).compare("b", "a", 3)
+        self.assertEqual(builder.remaining, 2)
+        self.assertEqual(builder.missing_pairs(), [("a", "c"), ("b", "c")])
+
+        self.assertIs(builder.compare("c", "a", 4).compare("b", "c", 5), model)
+        self.assertEqual(model.remaining_matrices, 2)
+        model.build_alternatives_comparison("X").compare("a", "b", 2).compare("a", "c", 2).compare("b", "c", 2)
+        self.assertEqual(model.remaining_matrices, 2)
+
+    def test_calculate_batch(self):
+        stack = np.array([
+            [[1, 2, 3], [1/2, 1, 4], [1/3, 1/4, 1]],
+            [[1, 1/5, 7], [5, 1, 2], [1/7, 1/2, 1]],
+        ])
+        calculators = [
+            AHP_complete_model.GMM_calculator(),
+            AHP_complete_model.EVM_calculator(),
+            AHP_complete_model.SimpleColumn_calculator(),
+            AHP_complete_model.SimpleScaledColumn_calculator(),
+        ]
+        for calculator in calculators:
+            batch = calculator.calculate_batch(stack)
+            self.assertEqual(batch.shape, (2, 3))
+            for layer, priorities in zip(stack, batch):
+                np.testing.assert_allclose(priorities, calculator.calculate_values(layer))
+
+    def test_top_k(self):
+        values = np.random.default_rng(0).integers(0, 50, 1000).astype(np.float64)
+        expected = sorted(range(len(values)), key=lambda index: (-values[index], index))
+        for k in [0, 1, 10, 999, 1000, 2000]:
+            self.assertEqual(list(top_k_indices(values, k)), expected[:k])
+
+        complete = (
+            AHP_model(["X", "Y"], {}, ["A", "B", "C"])
+            .build_alternatives_comparison("X").compare("A", "B", 3).compare("A", "C", 5).compare("B", "C", 2)
+            .build_alternatives_comparison("Y").compare("B", "A", 2).compare("C", "A", 4).compare("C", "B", 2)
+            .build_criteria_comparison().compare("X", "Y", 3)
+        )
+        ranking = sorted(complete.calculate_gmm().items(), key=lambda item: item[1], reverse=True)
+        self.assertEqual(complete.top_k("GMM", 2), ranking[:2])
+        self.assertEqual(complete.top_k("GMM", 2, start=1), ranking[1:])
+
+    def test_ratings(self):
+        model = (
+            AHP_builder()
+            .add_criterion("X").add_criterion("Y")
+            .add_alternative("A").add_alternative("B").add_alternative("C")
+            .add_rating_scale("Y", ["low", "medium", "high"])
+            .build()
+        )
+        self.assertEqual(model.remaining_matrices, 4)
+        self.assertEqual(model.matrix_keys(), [(CRITERIA_MATRIX, ""), (ALTERNATIVES_MATRIX, "X"), (INTENSITIES_MATRIX, "Y")])
+        self.assertRaises(AssertionError, model.build_alternatives_comparison, "Y")
+        self.assertRaises(AssertionError, model.add_alternatives_ratings, "Y", [0, 1, 3])
+
+        builder = model.build_alternatives_ratings("Y").rate("A", "high").rate("B", "low").rate("A", "medium")
+        self.assertEqual(builder.remaining, 1)
+        self.assertIs(builder.rate("C", "high"), model)
+        complete = (
+            model
+            .build_intensities_comparison("Y").compare("medium", "low", 3).compare("high", "low", 5).compare("high", "medium", 2)
+            .build_alternatives_comparison("X").compare("A", "B", 3).compare("A", "C", 5).compare("B", "C", 2)
+            .build_criteria_comparison().compare("X", "Y", 2)
+        )
+        self.assertIsInstance(complete, AHP_complete_model)
+
+        # Pairwise and rated columns share the ideal scale, the best alternative on each criterion scores 1
+        calculator = AHP_complete_model.GMM_calculator()
+        pairwise, rated = complete.criterion_priorities(calculator, "X"), complete.criterion_priorities(calculator, "Y")
+        self.assertAlmostEqual(pairwise.max(), 1)
+        self.assertAlmostEqual(rated.max(), 1)
+        self.assertEqual(list(rated.argsort()), [1, 0, 2])
+        weights = complete.leaf_weights(calculator)
+        np.testing.assert_allclose(list(complete.calculate_gmm().values()), weights[0] * pairwise + weights[1] * rated)
+        self.assertEqual(set(complete.consistency(Random_index_table())), set(model.matrix_keys()))
+
+        # Re-rating goes through the same invalidation as updating a matrix, and leaves the other ratings' scores alone
+        complete.model.add_alternatives_ratings("Y", {"A": "medium", "B": "low", "C": "low"})
+        self.assertEqual(complete.criterion_priorities(calculator, "Y")[0], rated[0])
+        self.assertEqual(complete.criterion_priorities(calculator, "Y")[2], rated[1])
+
+        complete.update_comparison((ALTERNATIVES_MATRIX, "X"), "C", "A", 2)
+        pairwise = complete.criterion_priorities(calculator, "X")
+        self.assertAlmostEqual(pairwise.max(), 1)
+        np.testing.assert_allclose(list(complete.calculate_gmm().values()), weights[0] * pairwise + weights[1] * complete.criterion_priorities(calculator, "Y"))
+
+    def test_ratings_many_alternatives(self):
+        # A0 wins the criterion weighing 0.9 by a wide margin and is rated poor on the other one
+        n = 200
+        alternatives = [f"A{i}" for i in range(n)]
+        dominant = np.ones((n, n))
+        dominant[0, 1:], dominant[1:, 0] = 9, 1 / 9
+        complete = (
+            AHP_model(["P", "R"], {}, alternatives, {"R": ["poor", "good"]})
+            .add_comparison_values({(CRITERIA_MATRIX, ""): [9], (ALTERNATIVES_MATRIX, "P"): dominant, (INTENSITIES_MATRIX, "R"): [1 / 5]})
+            .add_alternatives_ratings("R", [0] + [1] * (n - 1))
+        )
+        self.assertIsInstance(complete, AHP_complete_model)
+        for name in AHP_complete_model.METHODS:
+            self.assertEqual(complete.top_k(name, 1)[0][0], "A0", name)
+
+
+if __name__ == '__main__':
+    unittest.main()
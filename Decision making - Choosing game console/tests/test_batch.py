@@ -0,0 +1,57 @@
+import csv
+import json
+import os
+import tempfile
+
+import unittest
+
+from batch import ALTERNATIVES_FILE, ANSWERS_FILES, CRITERIA_FILE, main
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_batch(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for problem, value in [("first", 9), ("second", 1/9)]:
+                os.makedirs(os.path.join(directory, problem))
+                with open(os.path.join(directory, problem, ALTERNATIVES_FILE), 'w') as f:
+                    f.write("A\nB\n")
+                with open(os.path.join(directory, problem, CRITERIA_FILE), 'w') as f:
+                    f.write("X\nY\n")
+                with open(os.path.join(directory, problem, ANSWERS_FILES[0]), 'w') as f:
+                    answers = [
+                        {"matrix": "criteria", "first": "X", "second": "Y", "value": 1},
+                        {"matrix": "alternatives", "criterion": "X", "first": "A", "second": "B", "value": value},
+                        {"matrix": "alternatives", "criterion": "Y", "first": "A", "second": "B", "value": value},
+                    ]
+                    f.write(json.dumps({"respondent": "1", "answers": answers}) + "\n")
+            os.makedirs(os.path.join(directory, "broken"))
+            open(os.path.join(directory, "broken", CRITERIA_FILE), 'w').close()
+
+            output_path = os.path.join(directory, "results.jsonl")
+            self.assertEqual(main([directory, "-o", output_path, "-j", "2", "-m", "evm"]), 0)
+            with open(output_path) as f:
+                results = {result["problem"]: result for result in map(json.loads, f)}
+
+            self.assertGreater(results["first"]["ranking"]["A"], results["first"]["ranking"]["B"])
+            self.assertLess(results["second"]["ranking"]["A"], results["second"]["ranking"]["B"])
+            self.assertEqual(results["first"]["method"], "EVM")
+            self.assertIn("error", results["broken"])
+
+            csv_path = os.path.join(directory, "results.csv")
+            main([directory, "-o", csv_path, "-j", "1"])
+            with open(csv_path) as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(len([row for row in rows if row["kind"] == "score"]), 4)
+
+            profile_path = os.path.join(directory, "profile.json")
+            main([directory, "-o", output_path, "-j", "2", "--profile", profile_path])
+            with open(profile_path) as f:
+                stages = json.load(f)["stages"]
+            self.assertEqual(stages["calculate"]["calls"], 2)
+            with open(output_path) as f:
+                self.assertTrue(all("profile" not in json.loads(line) for line in f))
+
+
+if __name__ == '__main__':
+    unittest.main()
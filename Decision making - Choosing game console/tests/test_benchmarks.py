@@ -0,0 +1,44 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+import unittest
+
+from AHP.ahp import AHP_complete_model, validate_comparison_stack
+from benchmarks.bench_ahp import compare_with_baseline, consistent_matrix, main, noisy_matrix, run_benchmarks, synthetic_model
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_synthetic_matrices(self):
+        rng = np.random.default_rng(0)
+        validate_comparison_stack(np.stack([consistent_matrix(rng, 50), noisy_matrix(rng, 50, 1.0)]))
+
+        complete = synthetic_model(rng, 6, 3, 2)
+        self.assertIsInstance(complete, AHP_complete_model)
+        self.assertEqual(len(complete.model.leaf_criteria), 6)
+        self.assertAlmostEqual(sum(complete.calculate_gmm().values()), 1)
+
+    def test_report_and_baseline(self):
+        report = run_benchmarks([3, 4], repeats=1, criteria=2, select=["calculator/GMM", "score/"])
+        self.assertEqual({result["name"] for result in report["results"]}, {"calculator/GMM"} | {f"score/{name}" for name in AHP_complete_model.METHODS})
+        self.assertEqual(len(report["results"]), 2 * (1 + len(AHP_complete_model.METHODS)))
+
+        baseline = {"results": [dict(result, best=result["best"] / 10) for result in report["results"][:1]]}
+        comparisons = compare_with_baseline(report, baseline)
+        self.assertEqual(len(comparisons), 1)
+        self.assertTrue(comparisons[0]["regression"])
+        self.assertFalse(any(comparison["regression"] for comparison in compare_with_baseline(report, report)))
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output_path = os.path.join(directory, "report.json")
+            self.assertEqual(main(["-n", "3", "-r", "1", "-k", "koczkodaj", "-o", output_path]), 0)
+            self.assertEqual(main(["-n", "3", "-r", "1", "-k", "koczkodaj", "-o", output_path, "-b", output_path, "-t", "1000"]), 0)
+            with open(output_path) as f:
+                self.assertEqual([result["name"] for result in json.load(f)["results"]], ["koczkodaj", "koczkodaj/stack"])
+
+
+if __name__ == '__main__':
+    unittest.main()
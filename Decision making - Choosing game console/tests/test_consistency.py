@@ -0,0 +1,94 @@
+import itertools
+import json
+import os
+import tempfile
+
+import numpy as np
+import unittest
+
+from AHP.ahp import AHP_model, ALTERNATIVES_MATRIX, CRITERIA_MATRIX, SUB_CRITERIA_MATRIX
+from AHP.consistency import Random_index_table, random_reciprocal_matrices, simulate_random_index
+
+
+class TestConsistency(unittest.TestCase):
+
+    def setUp(self):
+        self.table = Random_index_table()
+
+    def build(self):
+        return (
+            AHP_model(["X", "Y", "Z"], {"Z": ["Z1", "Z2"]}, ["A", "B", "C"])
+            .build_alternatives_comparison("X").compare("A", "B", 2).compare("A", "C", 3).compare("B", "C", 4)
+            .build_alternatives_comparison("Y").compare("A", "B", 2).compare("A", "C", 4).compare("B", "C", 2)
+            .build_alternatives_comparison("Z1").compare("C", "A", 6).compare("C", "B", 5).compare("A", "B", 1)
+            .build_alternatives_comparison("Z2").compare("A", "B", 2).compare("C", "B", 2).compare("A", "C", 1)
+            .build_criteria_comparison().compare("X", "Y", 2).compare("X", "Z", 3).compare("Y", "Z", 2)
+            .build_sub_criteria_comparison("Z").compare("Z1", "Z2", 3)
+        )
+
+    def test_random_index(self):
+        # Monte Carlo values published for the 17-value Saaty scale
+        for n, expected in [(3, 0.5247), (4, 0.8816), (5, 1.1086), (10, 1.4858)]:
+            self.assertAlmostEqual(simulate_random_index(n, 4000), expected, delta=0.03)
+        self.assertEqual(simulate_random_index(2), 0.0)
+
+        stack = random_reciprocal_matrices(np.random.default_rng(0), 5, 6)
+        np.testing.assert_allclose(stack * stack.swapaxes(-1, -2), 1)
+
+    def test_random_index_table_is_persisted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache", "random_index.json")
+            values = Random_index_table(path, samples=100).get_many([3, 7])
+            with open(path) as f:
+                self.assertEqual(json.load(f)["values"], {"3": values[3], "7": values[7]})
+
+            table = Random_index_table(path, samples=100)
+            self.assertEqual(table.get(7), values[7])
+            self.assertEqual(set(table.values), {3, 7})
+            self.assertNotIn(7, Random_index_table(path, samples=100, seed=1).get_many([3]))
+
+    def test_model_consistency(self):
+        complete = self.build()
+        consistency = complete.consistency(self.table)
+        self.assertEqual(set(consistency), set(complete.model.matrix_keys()))
+
+        x = consistency[(ALTERNATIVES_MATRIX, "X")]
+        values = np.array([[1, 2, 3], [1/2, 1, 4], [1/3, 1/4, 1]])
+        self.assertAlmostEqual(x.lambda_max, max(np.linalg.eigvals(values).real))
+        self.assertAlmostEqual(x.consistency_index, (x.lambda_max - 3) / 2)
+        self.assertAlmostEqual(x.consistency_ratio, x.consistency_index / self.table.get(3))
+
+        w = complete.priority_cache["GMM"][(ALTERNATIVES_MATRIX, "X")]
+        squares = sum(np.log(values[i, j] * w[j] / w[i]) ** 2 for i, j in itertools.combinations(range(3), 2))
+        self.assertAlmostEqual(x.geometric_index, squares)
+
+        for key in [(ALTERNATIVES_MATRIX, "Y"), (SUB_CRITERIA_MATRIX, "Z")]:
+            self.assertAlmostEqual(consistency[key].consistency_ratio, 0)
+            self.assertAlmostEqual(consistency[key].geometric_index, 0)
+        self.assertEqual(consistency[(SUB_CRITERIA_MATRIX, "Z")].size, 2)
+        self.assertEqual(consistency[(CRITERIA_MATRIX, "")].size, 3)
+
+    def test_reuses_cached_priorities(self):
+        complete = self.build()
+        evm = complete.calculate_evm()
+        cached = complete.priority_cache["EVM"][(ALTERNATIVES_MATRIX, "X")]
+        complete.consistency(self.table)
+        self.assertIs(complete.priority_cache["EVM"][(ALTERNATIVES_MATRIX, "X")], cached)
+        self.assertEqual(complete.calculate_evm(), evm)
+
+    def test_incomplete_matrices(self):
+        labels = ["A", "B", "C", "D"]
+        complete = (
+            AHP_model(["X"], {}, labels)
+            .add_comparison_values({
+                (ALTERNATIVES_MATRIX, "X"): np.array([2, -1, 4, 3, -1, 2]),
+                (CRITERIA_MATRIX, ""): np.ones((1, 1)),
+            })
+        )
+        consistency = complete.consistency(self.table)[(ALTERNATIVES_MATRIX, "X")]
+        self.assertTrue(np.isfinite(consistency.consistency_ratio))
+        self.assertGreaterEqual(consistency.geometric_index, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
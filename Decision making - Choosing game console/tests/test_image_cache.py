@@ -0,0 +1,64 @@
+import threading
+
+import numpy as np
+import unittest
+
+from GUI.image_cache import Decoded_image, Texture_cache, downscale
+
+
+class TestImageCache(unittest.TestCase):
+
+    def build(self, capacity: int = 2):
+        self.decoded = []
+        self.queue = []
+        self.lock = threading.Lock()
+        def decode(path, max_size):
+            with self.lock:
+                self.decoded.append(path)
+            return Decoded_image(np.zeros((1, 1, 4), dtype=np.uint8), "rgba", False)
+        return Texture_cache(capacity=capacity, decode=decode, make_texture=lambda image: object(), dispatch=self.queue.append)
+
+    def run_queue(self, cache: Texture_cache):
+        cache.executor.shutdown(wait=True)
+        while self.queue:
+            self.queue.pop(0)()
+
+    def test_downscale(self):
+        pixels = np.arange(6 * 8 * 3, dtype=np.uint8).reshape(6, 8, 3)
+        self.assertIs(downscale(pixels, (8, 6)), pixels)
+
+        small = downscale(pixels, (4, 4))
+        self.assertEqual(small.shape, (3, 4, 3))
+        np.testing.assert_array_equal(small[0, 0], np.round(pixels[:2, :2].reshape(-1, 3).mean(axis=0)))
+
+    def test_lru(self):
+        cache = self.build()
+        a = cache.get("a")
+        cache.get("b")
+        self.assertIs(cache.get("a"), a)
+        cache.get("c")
+        self.assertEqual(list(cache.textures), ["a", "c"])
+        self.assertEqual(self.decoded, ["a", "b", "c"])
+
+    def test_prefetch(self):
+        cache = self.build()
+        cache.prefetch(["a", "b", "a"])
+        self.run_queue(cache)
+        self.assertEqual(list(cache.textures), ["a", "b"])
+        self.assertEqual(cache.pending, {})
+
+        cache.get("a")
+        cache.get("b")
+        self.assertEqual(sorted(self.decoded), ["a", "b"])
+
+    def test_get_waits_for_pending_decode(self):
+        cache = self.build()
+        cache.prefetch(["a"])
+        texture = cache.get("a")
+        self.run_queue(cache)
+        self.assertIs(cache.get("a"), texture)
+        self.assertEqual(self.decoded, ["a"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import threading
+
+import numpy as np
+import unittest
+
+from AHP.jobs import Scoring_job
+from tests.models import build_three_criteria_model
+
+
+class TestScoringJob(unittest.TestCase):
+
+    def test_results_are_delivered_progressively(self):
+        complete = build_three_criteria_model()
+        events = []
+        job = Scoring_job(
+            build_three_criteria_model, "EVM",
+            on_progress=lambda progress: events.append(("progress", progress)),
+            on_criterion=lambda result: events.append(("criterion", result)),
+            on_ranking=lambda ranking: events.append(("ranking", ranking)),
+        ).start()
+        self.assertTrue(job.wait(10))
+
+        results = [value for kind, value in events if kind == "criterion"]
+        self.assertEqual([result.criterion for result in results], ["X", "Y", "Z1", "Z2"])
+        expected_koczkodaj = complete.koczkoaj_all()
+        for result in results:
+            self.assertAlmostEqual(result.koczkodaj.value, expected_koczkodaj[result.criterion].value)
+
+        ranking = events[-2][1]
+        self.assertEqual(events[-2][0], "ranking")
+        expected = list(complete.calculate_evm().values())
+        np.testing.assert_allclose(results[-1].partial_scores, expected)
+        np.testing.assert_allclose(ranking, expected)
+        self.assertEqual(events[-1], ("progress", Scoring_job.Progress(Scoring_job.RANKING_STAGE, 1, 1)))
+
+    def test_callbacks_go_through_dispatch(self):
+        queue = []
+        job = Scoring_job(build_three_criteria_model, on_ranking=lambda ranking: queue.append(ranking), dispatch=queue.append).start()
+        self.assertTrue(job.wait(10))
+
+        callbacks = list(queue)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(queue), len(callbacks) + 1)
+        self.assertIsInstance(queue[-1], np.ndarray)
+
+    def test_cancel(self):
+        release = threading.Event()
+        def get_model():
+            release.wait(10)
+            return build_three_criteria_model()
+
+        events = []
+        job = Scoring_job(get_model, on_criterion=events.append, on_ranking=events.append).start()
+        job.cancel()
+        release.set()
+        self.assertTrue(job.wait(10))
+        self.assertEqual(events, [])
+
+    def test_cancel_drops_queued_callbacks(self):
+        queue = []
+        events = []
+        job = Scoring_job(build_three_criteria_model, on_ranking=events.append, dispatch=queue.append).start()
+        self.assertTrue(job.wait(10))
+        job.cancel()
+        for callback in queue:
+            callback()
+        self.assertEqual(events, [])
+
+    def test_error(self):
+        errors = []
+        def get_model():
+            raise ValueError("broken")
+
+        job = Scoring_job(get_model, on_error=errors.append).start()
+        self.assertTrue(job.wait(10))
+        self.assertIsInstance(errors[0], ValueError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+
+import numpy as np
+import unittest
+
+from AHP.ahp import ALTERNATIVES_MATRIX, CRITERIA_MATRIX
+from AHP.journal import ANSWER_DTYPE, Answer_journal
+
+
+class TestJournal(unittest.TestCase):
+    keys = [(CRITERIA_MATRIX, ""), (ALTERNATIVES_MATRIX, "X")]
+    sizes = [2, 3]
+
+    def test_replay(self):
+        journal = Answer_journal(self.keys, self.sizes)
+        for i in range(100):
+            journal.append((ALTERNATIVES_MATRIX, "X"), 0, 1, 2)
+        journal.append((ALTERNATIVES_MATRIX, "X"), 2, 0, 4).append((ALTERNATIVES_MATRIX, "X"), 0, 2, 3)
+        journal.append((ALTERNATIVES_MATRIX, "X"), 1, 0, 5)
+        self.assertEqual(len(journal), 103)
+        self.assertRaises(AssertionError, journal.append, (CRITERIA_MATRIX, ""), 0, 2, 3)
+        self.assertRaises(AssertionError, journal.append, (CRITERIA_MATRIX, ""), 0, 1, -3)
+
+        matrices = journal.replay()
+        np.testing.assert_allclose(matrices[(ALTERNATIVES_MATRIX, "X")], [[1, 1/5, 3], [5, 1, -1], [1/3, -1, 1]])
+        np.testing.assert_allclose(matrices[(CRITERIA_MATRIX, "")], [[1, -1], [-1, 1]])
+        self.assertEqual(len(journal.latest()), 2)
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session", "answers.journal")
+            journal = Answer_journal(self.keys, self.sizes, path)
+            journal.append((CRITERIA_MATRIX, ""), 1, 0, 7).append((ALTERNATIVES_MATRIX, "X"), 1, 2, 2)
+            journal.sync()
+            # Half of a record, as left by a crash in the middle of a write
+            journal.file.write(np.zeros(1, dtype=ANSWER_DTYPE).tobytes()[:5])
+            journal.file.close()
+
+            resumed = Answer_journal(self.keys, self.sizes, path)
+            self.assertEqual(len(resumed), 2)
+            np.testing.assert_array_equal(resumed.entries, journal.entries)
+            resumed.append((ALTERNATIVES_MATRIX, "X"), 0, 1, 3)
+            resumed.close()
+            self.assertEqual(len(Answer_journal(self.keys, self.sizes, path)), 3)
+            self.assertRaises(AssertionError, Answer_journal, self.keys, [2, 4], path)
+
+            cleared = Answer_journal(self.keys, self.sizes, path)
+            cleared.clear()
+            cleared.close()
+            self.assertEqual(len(Answer_journal(self.keys, self.sizes, path)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+
+import numpy as np
+import unittest
+
+from AHP.ahp import AHP_complete_model, AHP_model, ALTERNATIVES_MATRIX, CRITERIA_MATRIX
+from AHP.persistence import load_comparison_csv_directory, load_model, save_model, write_comparison_csv_directory
+from tests.models import build_two_criteria_model
+
+
+class TestPersistence(unittest.TestCase):
+
+    def test_round_trip(self):
+        complete = build_two_criteria_model()
+        expected = complete.calculate_all()
+
+        with tempfile.TemporaryDirectory() as directory:
+            save_model(complete, directory)
+            loaded = load_model(directory)
+
+            self.assertIsInstance(loaded, AHP_complete_model)
+            self.assertIsInstance(loaded.model.get_matrix((ALTERNATIVES_MATRIX, "X")).values.base, np.memmap)
+            self.assertEqual(set(loaded.priority_cache), set(expected))
+            self.assertEqual(loaded.calculate_all(), expected)
+
+            # Edits go to a private copy of the matrix, the saved model stays as it was
+            loaded.update_comparison((ALTERNATIVES_MATRIX, "X"), "B", "A", 3)
+            edited = build_two_criteria_model().update_comparison((ALTERNATIVES_MATRIX, "X"), "B", "A", 3)
+            for name, result in loaded.calculate_all().items():
+                for alternative, value in edited.calculate_all()[name].items():
+                    self.assertAlmostEqual(result[alternative], value, 10)
+            self.assertIsInstance(loaded.model.get_matrix((ALTERNATIVES_MATRIX, "Y1")).values.base, np.memmap)
+            self.assertEqual(load_model(directory).calculate_all(), expected)
+
+            editable = load_model(directory, mmap_mode="c")
+            editable.update_comparison((ALTERNATIVES_MATRIX, "X"), "B", "A", 3)
+            self.assertEqual(load_model(directory).calculate_all(), expected)
+
+    def test_partial_model(self):
+        with tempfile.TemporaryDirectory() as directory:
+            save_model(build_two_criteria_model(complete=False), directory)
+            loaded = load_model(directory)
+
+            self.assertIsInstance(loaded, AHP_model)
+            self.assertEqual(loaded.remaining_matrices, 1)
+            self.assertIsInstance(loaded.build_sub_criteria_comparison("Y").compare("Y1", "Y2", 3), AHP_complete_model)
+
+    def test_csv_directory(self):
+        complete = build_two_criteria_model()
+        with tempfile.TemporaryDirectory() as directory:
+            write_comparison_csv_directory(complete, directory)
+            self.assertTrue(os.path.exists(os.path.join(directory, "alternatives-Y1.csv")))
+            self.assertTrue(os.path.exists(os.path.join(directory, CRITERIA_MATRIX + ".csv")))
+
+            loaded = load_comparison_csv_directory(AHP_model(["X", "Y"], {"Y": ["Y1", "Y2"]}, ["A", "B", "C"]), directory)
+            self.assertEqual(loaded.calculate_all(), complete.calculate_all())
+
+    def test_ratings(self):
+        complete = (
+            AHP_model(["X", "Y"], {}, ["A", "B", "C"], {"Y": ["low", "high"]})
+            .build_alternatives_comparison("X").compare("A", "B", 5).compare("A", "C", 7).compare("B", "C", 2)
+            .build_intensities_comparison("Y").compare("high", "low", 4)
+            .add_alternatives_ratings("Y", {"A": "low", "B": "high", "C": "high"})
+            .build_criteria_comparison().compare("X", "Y", 2)
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            save_model(complete, directory)
+            loaded = load_model(directory)
+
+            self.assertIsInstance(loaded, AHP_complete_model)
+            self.assertEqual(loaded.model.rating_scales, {"Y": ["low", "high"]})
+            self.assertEqual(loaded.calculate_all(), complete.calculate_all())
+
+
+if __name__ == '__main__':
+    unittest.main()
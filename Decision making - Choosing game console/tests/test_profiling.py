@@ -0,0 +1,76 @@
+import threading
+
+import unittest
+
+from AHP.ahp import AHP_model
+from AHP.profiling import Profiler, profiled, profiler
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        profiler.reset()
+
+    def build(self):
+        return (
+            AHP_model(["X", "Y"], {}, ["A", "B", "C"])
+            .build_alternatives_comparison("X").compare("A", "B", 3).compare("A", "C", 5).compare("B", "C", 2)
+            .build_alternatives_comparison("Y").compare("B", "A", 2).compare("C", "A", 4).compare("C", "B", 2)
+            .build_criteria_comparison().compare("X", "Y", 3)
+        )
+
+    def test_disabled(self):
+        self.build().calculate_gmm()
+        self.assertEqual(profiler.to_dict(), {"stages": {}, "self_seconds": {}})
+        self.assertEqual(profiler.to_folded(), "")
+
+    def test_scoring_stages(self):
+        with profiler.profile():
+            complete = self.build()
+            complete.calculate_evm()
+            complete.koczkoaj_all()
+        self.assertFalse(profiler.enabled)
+
+        stages = profiler.to_dict()["stages"]
+        self.assertEqual(stages["calculate"]["calls"], 1)
+        self.assertEqual(stages["calculate"]["sizes"], {"3": 1})
+        self.assertEqual(stages["calculator/EVM"]["sizes"], {"2": 1, "3": 1})
+        self.assertEqual(stages["koczkodaj"]["calls"], 1)
+        self.assertIn("calculate;alternatives_priorities;calculator/EVM", profiler.to_dict()["self_seconds"])
+
+    def test_nested_self_time(self):
+        local = Profiler()
+        local.enable()
+        with local.stage("outer"):
+            with local.stage("inner", 4):
+                pass
+            with local.stage("inner", 4):
+                pass
+        report = local.to_dict()
+
+        self.assertEqual(report["stages"]["inner"]["calls"], 2)
+        self.assertEqual(report["stages"]["inner"]["sizes"], {"4": 2})
+        self.assertAlmostEqual(report["self_seconds"]["outer"] + report["self_seconds"]["outer;inner"], report["stages"]["outer"]["seconds"])
+        self.assertEqual([line.rsplit(" ", 1)[0] for line in local.to_folded().splitlines()], ["outer", "outer;inner"])
+
+        merged = Profiler().add(report).add(report).to_dict()
+        self.assertEqual(merged["stages"]["inner"]["calls"], 4)
+        self.assertEqual(merged["stages"]["inner"]["sizes"], {"4": 4})
+
+    def test_threads_keep_separate_stacks(self):
+        @profiled("work")
+        def work():
+            pass
+
+        with profiler.profile():
+            threads = [threading.Thread(target=work) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(profiler.to_dict()["stages"]["work"]["calls"], 4)
+        self.assertEqual(list(profiler.to_dict()["self_seconds"]), ["work"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import numpy as np
+import unittest
+
+from AHP.ahp import AHP_complete_model, AHP_model
+from AHP.robustness import SHARD_SAMPLES, Robustness_analysis
+from tests.models import build_two_criteria_model
+
+
+class TestRobustness(unittest.TestCase):
+
+    def test_no_noise_keeps_ranking(self):
+        result = build_two_criteria_model().simulate_robustness(100, sigma=0.0, seed=1)
+        self.assertEqual(result.top_probability, {"A": 1.0, "B": 0.0, "C": 0.0})
+        self.assertEqual(set(result.same_rank_probability.values()), {1.0})
+
+    def test_deep_hierarchy(self):
+        complete = (
+            AHP_model(["X", "Y"], {"Y": ["Y1", "Y2"], "Y2": ["Y21", "Y22"]}, ["A", "B"])
+            .build_alternatives_comparison("X").compare("A", "B", 3)
+            .build_alternatives_comparison("Y1").compare("B", "A", 2)
+            .build_alternatives_comparison("Y21").compare("B", "A", 4)
+            .build_alternatives_comparison("Y22").compare("A", "B", 5)
+            .build_criteria_comparison().compare("Y", "X", 2)
+            .build_sub_criteria_comparison("Y").compare("Y2", "Y1", 3)
+            .build_sub_criteria_comparison("Y2").compare("Y21", "Y22", 1)
+        )
+        top = max(complete.calculate_gmm().items(), key=lambda item: item[1])[0]
+        result = complete.simulate_robustness(100, sigma=0.0, seed=1)
+        self.assertEqual(result.top_probability[top], 1.0)
+
+    def test_simulate(self):
+        analysis = Robustness_analysis(build_two_criteria_model())
+        result = analysis.simulate(SHARD_SAMPLES + 500, sigma=0.5, seed=7)
+
+        np.testing.assert_allclose(result.rank_probabilities.sum(axis=0), 1)
+        np.testing.assert_allclose(result.rank_probabilities.sum(axis=1), 1)
+        self.assertGreater(result.top_probability["A"], 0.5)
+        self.assertLess(result.top_probability["A"], 1.0)
+        np.testing.assert_array_equal(analysis.simulate(SHARD_SAMPLES + 500, sigma=0.5, seed=7, workers=2).rank_probabilities, result.rank_probabilities)
+
+    def test_incomplete_matrices(self):
+        complete = (
+            AHP_model(["X", "Y"], {}, ["A", "B", "C", "D"])
+            .build_alternatives_comparison("X").compare("A", "B", 5).compare("B", "C", 3).compare("C", "D", 2).finish()
+            .build_alternatives_comparison("Y").compare("A", "B", 2).compare("A", "C", 4).compare("A", "D", 3).finish()
+            .build_criteria_comparison().compare("X", "Y", 2)
+        )
+        self.assertIsInstance(complete, AHP_complete_model)
+        with np.errstate(all="raise"):
+            result = complete.simulate_robustness(200, sigma=0.0, seed=1)
+        top = max(complete.calculate_gmm().items(), key=lambda item: item[1])[0]
+        self.assertEqual(result.top_probability[top], 1.0)
+        self.assertEqual(set(result.same_rank_probability.values()), {1.0})
+
+        with np.errstate(all="raise"):
+            result = complete.simulate_robustness(500, sigma=0.5, seed=1)
+        np.testing.assert_allclose(result.rank_probabilities.sum(axis=0), 1)
+        np.testing.assert_allclose(result.rank_probabilities.sum(axis=1), 1)
+
+    def test_evm(self):
+        complete = build_two_criteria_model()
+        result = Robustness_analysis(complete, AHP_complete_model.EVM_calculator()).simulate(200, sigma=0.0, seed=3)
+        self.assertEqual(result.top_probability["A"], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import math
+
+import numpy as np
+import unittest
+
+from AHP.scheduler import Adaptive_pair_scheduler
+
+
+class TestScheduler(unittest.TestCase):
+
+    def run_scheduler(self, weights: np.ndarray, noise: float = 0.0, seed: int = 0) -> Adaptive_pair_scheduler:
+        rng = np.random.default_rng(seed)
+        labels = [str(index) for index in range(len(weights))]
+        scheduler = Adaptive_pair_scheduler(labels)
+        while (pair := scheduler.next_pair()) is not None:
+            i, j = int(pair[0]), int(pair[1])
+            scheduler.answer(*pair, weights[i] / weights[j] * math.exp(rng.normal(0.0, noise)))
+        return scheduler
+
+    def test_consistent_judgments(self):
+        weights = np.random.default_rng(1).permutation(np.arange(1, 41))
+        scheduler = self.run_scheduler(weights)
+
+        self.assertEqual(scheduler.get_ranking(), [str(index) for index in np.argsort(-weights)])
+        self.assertLess(scheduler.questions, 60)
+
+    def test_noisy_judgments(self):
+        weights = np.random.default_rng(2).permutation(np.linspace(1, 9, 30))
+        scheduler = self.run_scheduler(weights, noise=0.2)
+
+        self.assertTrue(scheduler.is_finished())
+        self.assertLess(scheduler.questions, 30 * 29 // 2)
+        self.assertGreater(np.corrcoef(scheduler.priorities, weights / weights.sum())[0, 1], 0.9)
+
+    def test_upcoming_pairs(self):
+        weights = np.array([5.0, 1.0, 3.0, 2.0, 8.0, 4.0])
+        scheduler = Adaptive_pair_scheduler([str(index) for index in range(len(weights))])
+        while (pair := scheduler.next_pair()) is not None:
+            upcoming = scheduler.upcoming_pairs(3)
+            self.assertEqual(upcoming[0], pair)
+            self.assertEqual(len(set(upcoming)), len(upcoming))
+            i, j = int(pair[0]), int(pair[1])
+            scheduler.answer(*pair, weights[i] / weights[j])
+        self.assertEqual(scheduler.upcoming_pairs(3), [])
+
+    def test_small(self):
+        self.assertIsNone(Adaptive_pair_scheduler(["a"]).next_pair())
+        scheduler = Adaptive_pair_scheduler(["a", "b"])
+        self.assertEqual(scheduler.next_pair(), ("a", "b"))
+        self.assertIsNone(scheduler.answer("b", "a", 3).next_pair())
+        self.assertEqual(scheduler.get_ranking(), ["b", "a"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import numpy as np
+import unittest
+
+from AHP.sensitivity import Sensitivity_analysis
+from tests.models import build_three_criteria_model
+
+
+class TestSensitivity(unittest.TestCase):
+
+    def test_scores_match_model(self):
+        complete = build_three_criteria_model()
+        analysis = Sensitivity_analysis(complete)
+        np.testing.assert_allclose(analysis.scores, list(complete.calculate_gmm().values()))
+
+    def test_sweep_weights(self):
+        analysis = Sensitivity_analysis(build_three_criteria_model())
+        result = analysis.sweep_weights(["X", "Y"], np.linspace(0, 1, 11))
+
+        self.assertEqual(len(result.weights), 66)
+        np.testing.assert_allclose(result.weights.sum(axis=1), 1)
+        np.testing.assert_allclose(result.scores, result.weights @ analysis.contributions.T)
+
+    def test_rank_reversal(self):
+        analysis = Sensitivity_analysis(build_three_criteria_model())
+        top = analysis.alternatives[int(np.argmax(analysis.scores))]
+
+        for reversal in analysis.rank_reversals():
+            for threshold, alternative in [(reversal.lower, reversal.lower_alternative), (reversal.upper, reversal.upper_alternative)]:
+                if threshold is None:
+                    continue
+                scores = analysis.sweep_weights([reversal.criterion], [threshold]).scores[0]
+                self.assertAlmostEqual(scores[analysis.alternatives.index(alternative)], scores[analysis.alternatives.index(top)])
+                inside = (threshold + reversal.weight) / 2
+                scores = analysis.sweep_weights([reversal.criterion], [inside]).scores[0]
+                self.assertEqual(analysis.alternatives[int(np.argmax(scores))], top)
+
+
+if __name__ == '__main__':
+    unittest.main()
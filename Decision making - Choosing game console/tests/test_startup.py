@@ -0,0 +1,35 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import unittest
+
+PROJECT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_TIME_BUDGET = 1.0
+
+
+def run_python(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], cwd=PROJECT_PATH, capture_output=True, text=True, check=True).stdout
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_import_time(self):
+        for module in ["AHP.ahp", "sugestator_to_model"]:
+            elapsed = float(run_python(f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"))
+            self.assertLess(elapsed, IMPORT_TIME_BUDGET, module)
+
+    def test_core_does_not_load_test_or_gui_modules(self):
+        loaded = run_python("import sys, AHP.ahp, sugestator_to_model; print(' '.join(sys.modules))").split()
+        for module in ["unittest", "kivy", "concurrent.futures.process"]:
+            self.assertNotIn(module, loaded)
+
+    @unittest.skipIf(importlib.util.find_spec("kivy") is None or importlib.util.find_spec("kivymd") is None, "kivy is not installed")
+    def test_gui_import_is_lazy(self):
+        loaded = run_python("import sys, GUI.gui; print(' '.join(sys.modules))").split()
+        for module in ["sugestator_to_model", "kivy.core.window"]:
+            self.assertNotIn(module, loaded)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+
+import numpy as np
+import unittest
+
+from AHP.ahp import AHP_complete_model, ALTERNATIVES_MATRIX, CRITERIA_MATRIX, SUB_CRITERIA_MATRIX
+from sugestator_to_model import SugestatorToModel
+
+
+class TestSugestatorToModel(unittest.TestCase):
+
+    def load(self, criteria: str, journal_path: str|None = None) -> SugestatorToModel:
+        with tempfile.TemporaryDirectory() as directory:
+            alternatives_path, criteria_path = os.path.join(directory, "alternatives.txt"), os.path.join(directory, "criteria.txt")
+            with open(alternatives_path, 'w') as f:
+                f.write("A\nB\nC\n")
+            with open(criteria_path, 'w') as f:
+                f.write(criteria)
+            return SugestatorToModel(alternatives_path, criteria_path, journal_path)
+
+    def test_nested_criteria(self):
+        sugestator = self.load("Price\nComfort\n    Size\n    Heat\n        CPU\n\tGPU\n    Loudness\nGames\n  Online\n")
+        self.assertEqual(sugestator.criteria, ["Price", "Comfort", "Games"])
+        self.assertEqual(sugestator.sub_criteria, {"Comfort": ["Size", "Heat", "GPU", "Loudness"], "Heat": ["CPU"], "Games": ["Online"]})
+        self.assertEqual(sugestator.get_criteria_to_choose(), ["Price", "Size", "CPU", "GPU", "Loudness", "Online"])
+        self.assertEqual(sugestator.model.leaf_criteria, sugestator.get_criteria_to_choose())
+        self.assertIn(("Size", "Heat"), sugestator.get_criteria_and_subcriteria_combinations())
+
+    def test_answers_into_deep_model(self):
+        sugestator = self.load("Price\nComfort\n    Size\n    Heat\n        CPU\n        GPU\n")
+        sugestator.set_mapping_function(lambda value: value)
+        for criterion in sugestator.get_criteria_to_choose():
+            while (pair := sugestator.next_alternatives_pair(criterion)) is not None:
+                sugestator.add_partial_comparision(*pair, criterion, 2 if pair[0] == "A" else -2)
+        for first, second in sugestator.get_criteria_and_subcriteria_combinations():
+            sugestator.add_partial_cryteria_comparision(first, second, 1)
+
+        complete = sugestator.load_comparisions_value_into_model()
+        self.assertIsInstance(complete, AHP_complete_model)
+        result = complete.calculate_gmm()
+        self.assertAlmostEqual(sum(result.values()), 1)
+        self.assertEqual(max(result, key=result.get), "B")
+        np.testing.assert_allclose(complete.leaf_weights(AHP_complete_model.GMM_calculator()), [1/2, 1/4, 1/8, 1/8])
+
+    def test_resume_from_journal(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "answers.journal")
+            sugestator = self.load("Price\nComfort\n    Size\n    Heat\n", path)
+            sugestator.add_partial_comparision("A", "B", "Price", 2)
+            sugestator.add_partial_comparision("B", "A", "Price", 3)
+            sugestator.add_partial_cryteria_comparision("Price", "Comfort", -1)
+            sugestator.add_partial_cryteria_comparision("Size", "Heat", 2)
+            sugestator.sync()
+            matrices = sugestator.get_comparision_matrices()
+            self.assertEqual(matrices[(ALTERNATIVES_MATRIX, "Price")][0, 1], 3)
+            self.assertEqual(matrices[(CRITERIA_MATRIX, "")][0, 1], 1)
+            self.assertEqual(matrices[(SUB_CRITERIA_MATRIX, "Comfort")][1, 0], 2)
+
+            resumed = self.load("Price\nComfort\n    Size\n    Heat\n", path)
+            for key, matrix in resumed.get_comparision_matrices().items():
+                np.testing.assert_array_equal(matrix, matrices[key])
+            self.assertNotIn(resumed.next_alternatives_pair("Price"), [("A", "B"), ("B", "A")])
+
+            resumed.reset()
+            resumed.add_partial_comparision("A", "C", "Size", 1)
+            resumed.close()
+            self.assertIsNone(resumed.journal.file)
+            reloaded = self.load("Price\nComfort\n    Size\n    Heat\n", path)
+            self.assertEqual(len(reloaded.journal), 1)
+            reloaded.close()
+
+
+if __name__ == '__main__':
+    unittest.main()